@@ -0,0 +1,77 @@
+import base64
+import hashlib
+import io
+import os
+
+import streamlit as st
+
+from data import CACHE_DIR
+
+# ---------------------- IMAGE ASSETS ----------------------
+# Portraits and member photos are cropped and resized to their display size
+# (at 2x for high-density screens), encoded as WebP once per source file
+# content and kept on disk, then embedded as cached data URIs. Pages no
+# longer base64-encode the full-size originals on every rerun.
+
+THUMB_DIR = os.path.join(CACHE_DIR, "thumbnails")
+SCALE = 2
+WEBP_QUALITY = 80
+
+MIME_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".gif": "image/gif"}
+
+
+def _source_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def _encode_thumbnail(path, width, height):
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as img:
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+        # Same centre crop as CSS object-fit: cover
+        img = ImageOps.fit(img, (width * SCALE, height * SCALE), method=Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format="WEBP", quality=WEBP_QUALITY, method=6)
+        return out.getvalue()
+
+
+def thumbnail(path, width, height):
+    # WebP bytes for `path` at width x height CSS pixels, cached on disk by source hash
+    thumb_path = os.path.join(THUMB_DIR, f"{_source_hash(path)}-{width}x{height}.webp")
+    if os.path.exists(thumb_path):
+        with open(thumb_path, "rb") as f:
+            return f.read()
+
+    data = _encode_thumbnail(path, width, height)
+    try:
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        tmp_path = f"{thumb_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, thumb_path)
+    except OSError:
+        pass
+    return data
+
+
+@st.cache_data(show_spinner=False)
+def _data_uri(path, mtime_ns, width, height):
+    try:
+        data = thumbnail(path, width, height)
+        mime = "image/webp"
+    except (ImportError, OSError):
+        # No Pillow or an unreadable image: fall back to the original file
+        with open(path, "rb") as f:
+            data = f.read()
+        mime = MIME_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+    return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+
+def image_data_uri(path, width, height):
+    # Returns None when the image does not exist
+    if not os.path.exists(path):
+        return None
+    return _data_uri(path, os.stat(path).st_mtime_ns, width, height)
@@ -0,0 +1,301 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# ---------------------- RERUN BENCHMARKS ----------------------
+# Drives every page headlessly with Streamlit's AppTest against synthetic
+# datasets of increasing size and reports cold/warm rerun latency and peak
+# memory per page and per scripted interaction, as JSON.
+#
+#   python bench.py --rows 2600 100000 1000000 10000000 --output bench.json
+#
+# Each page runs in a fresh worker process so "cold" really is the first
+# rerun of a new server process (the Arrow sidecar on disk is already built,
+# as after the first deploy). Latency and memory are measured in separate
+# workers because tracemalloc slows the interpreter down. A third worker
+# opens several sessions of the same page in one process and reports the
+# memory each extra concurrent session retains on top of the shared data.
+# The cache warm-up is off in these workers; a fourth worker lets it finish
+# first and times the first session's load after it. The shared snapshot is
+# off too, except in a fifth worker that starts from one built beforehand
+# and reports its first load and private (non-shared) memory.
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(REPO_DIR, "web.py")
+DEFAULT_ROWS = [2_600, 100_000, 1_000_000, 10_000_000]
+TIMEOUT_S = 1800
+DEFAULT_SESSIONS = 8
+
+
+# Scripted interactions per page: (step name, action on the AppTest)
+def _dataset_range(at):
+    low, high = at.slider[0].min, at.slider[0].max
+    return at.slider[0].set_value((low, low + (high - low) / 4))
+
+
+SCENARIOS = {
+    "homepage": [],
+    "facts": [
+        ("location_region", lambda at: at.selectbox[0].select("Europe")),
+        ("location_resolution", lambda at: at.select_slider[0].set_value("Fine")),
+    ],
+    "dataset": [
+        ("all_countries", lambda at: at.multiselect[0].set_value(at.multiselect[0].options)),
+        ("net_worth_slider", _dataset_range),
+        ("sort_by_age", lambda at: at.selectbox[0].select("age")),
+        ("next_page", lambda at: at.number_input[0].increment()),
+    ],
+    "code": [
+        ("select_facts", lambda at: at.selectbox[0].select_index(1)),
+    ],
+    "starts": [
+        ("age_group", lambda at: at.selectbox[0].select("41–50")),
+        ("country", lambda at: at.selectbox[1].select_index(2)),
+        ("self_made_toggle", lambda at: at.checkbox[0].uncheck()),
+    ],
+    "inequality": [
+        ("by_country", lambda at: at.selectbox[0].select("Country")),
+        ("country", lambda at: at.selectbox[1].select_index(1)),
+    ],
+}
+
+
+def _peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _private_rss_bytes():
+    # Resident memory not backed by a file: what a process does not share
+    # through the page cache (Linux only)
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _measure(run, trace):
+    if trace:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    result = {"seconds": seconds}
+    if trace:
+        result["peak_alloc_bytes"] = tracemalloc.get_traced_memory()[1]
+    result["peak_rss_bytes"] = _peak_rss_bytes()
+    result["private_rss_bytes"] = _private_rss_bytes()
+    return result
+
+
+def run_worker(page, trace, warmed=False, mapped=False):
+    # Runs inside a fresh process; BILLIONAIRES_CSV is already set
+    from streamlit.testing.v1 import AppTest
+
+    if trace:
+        tracemalloc.start()
+
+    at = AppTest.from_file(APP_PATH, default_timeout=TIMEOUT_S)
+    at.session_state["current_page"] = page
+
+    steps = []
+    if warmed:
+        # The server-start warm-up, finished before the first session arrives
+        import warmup
+
+        warmup.start()
+        status = warmup.wait(TIMEOUT_S)
+        steps.append({"page": page, "step": "warmup", "phase": status["state"], "seconds": status["seconds"]})
+
+    def record(step, phase, result):
+        steps.append({"page": page, "step": step, "phase": phase, **result})
+        if at.exception:
+            steps[-1]["error"] = str(at.exception[0].value)
+
+    phase = "after_warmup" if warmed else "from_snapshot" if mapped else "cold"
+    record("load", phase, _measure(at.run, trace))
+    if warmed or mapped:
+        return steps
+    record("load", "warm", _measure(at.run, trace))
+    for step, action in SCENARIOS[page]:
+        record(step, "cold", _measure(lambda: action(at).run(), trace))
+        # Repeat the same widget state: what another session sees on a warm cache
+        record(step, "warm", _measure(at.run, trace))
+    return steps
+
+
+def run_sessions(page, n_sessions):
+    # Every AppTest is a separate session sharing the process-wide frame,
+    # derived structures and caches, as concurrent browser tabs do
+    from streamlit.testing.v1 import AppTest
+
+    tracemalloc.start()
+    sessions = []
+
+    def open_session():
+        at = AppTest.from_file(APP_PATH, default_timeout=TIMEOUT_S)
+        at.session_state["current_page"] = page
+        at.run()
+        sessions.append(at)
+
+    open_session()
+    gc.collect()
+    shared = tracemalloc.get_traced_memory()[0]
+    for _ in range(n_sessions - 1):
+        open_session()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - shared
+    return {
+        "page": page, "step": "sessions", "phase": "warm", "sessions": n_sessions,
+        "shared_alloc_bytes": shared,
+        "bytes_per_session": retained / max(n_sessions - 1, 1),
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+
+def _worker_env(csv_path, warmup=False, snapshot=False):
+    env = dict(os.environ)
+    env["BILLIONAIRES_CSV"] = csv_path
+    env["BILLIONAIRES_WARMUP"] = "1" if warmup else "0"
+    env["BILLIONAIRES_SNAPSHOT"] = "1" if snapshot else "0"
+    return env
+
+
+def _spawn(args, csv_path, warmup=False, snapshot=False):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__)] + args,
+        cwd=REPO_DIR, env=_worker_env(csv_path, warmup, snapshot), capture_output=True, text=True,
+        timeout=TIMEOUT_S * 4,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"worker {args} failed:\n{out.stderr[-4000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_suite(rows, pages, memory=True, sessions=DEFAULT_SESSIONS):
+    import synthetic
+
+    results = []
+    for n_rows in rows:
+        csv_path = synthetic.ensure(n_rows)
+        ingest = _spawn(["--ingest"], csv_path)
+        results.append({"rows": n_rows, "page": None, "step": "ingest", "phase": "cold", **ingest})
+        print(f"[bench] {n_rows} rows: ingest {ingest['seconds']:.2f}s", file=sys.stderr)
+        built = _spawn(["--snapshot"], csv_path)
+        results.append({"rows": n_rows, "page": None, "step": "snapshot", "phase": "cold", **built})
+        print(
+            f"[bench] {n_rows} rows: snapshot {built['seconds']:.2f}s, {built['snapshot_bytes'] / 2**20:.0f} MB",
+            file=sys.stderr,
+        )
+
+        for page in pages:
+            timings = _spawn(["--worker", page], csv_path)
+            if memory:
+                traced = _spawn(["--worker", page, "--trace"], csv_path)
+                for timing, mem in zip(timings, traced):
+                    timing["peak_alloc_bytes"] = mem.get("peak_alloc_bytes")
+            timings += _spawn(["--worker", page, "--warmed"], csv_path, warmup=True)
+            timings += _spawn(["--worker", page, "--mapped"], csv_path, snapshot=True)
+            for timing in timings:
+                results.append({"rows": n_rows, **timing})
+                private = timing.get("private_rss_bytes") if timing["step"] == "load" else None
+                print(
+                    f"[bench] {n_rows} rows: {page}/{timing['step']} {timing['phase']} "
+                    f"{timing['seconds'] * 1000:.1f} ms" + (f", {private / 2**20:.0f} MB private" if private else ""),
+                    file=sys.stderr,
+                )
+            if sessions > 1:
+                concurrent = _spawn(["--worker", page, "--sessions", str(sessions), "--concurrent"], csv_path)
+                results.append({"rows": n_rows, **concurrent})
+                print(
+                    f"[bench] {n_rows} rows: {page} {concurrent['bytes_per_session'] / 1024:.0f} KB per extra session",
+                    file=sys.stderr,
+                )
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def run_ingest():
+    # Parse the CSV and write the sidecar from scratch, as a cold deploy does
+    import data
+
+    sidecar_path, manifest_path = data._sidecar_paths(data.CSV_PATH)
+    for path in (sidecar_path, manifest_path):
+        if os.path.exists(path):
+            os.remove(path)
+    return _measure(lambda: data.load_frame(data.CSV_PATH), trace=False)
+
+
+def run_snapshot():
+    # Build the shared snapshot from the sidecar, as the deploy step before
+    # the server processes start
+    import data
+    import registry
+
+    for key in registry.PAGES:
+        registry.load_page(key)
+    paths = []
+    result = _measure(lambda: paths.append(data.write_snapshot()), trace=False)
+    result["snapshot_bytes"] = os.path.getsize(paths[0])
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark page reruns on synthetic datasets.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--pages", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS,
+                        help="concurrent sessions for the per-session memory pass (0 skips it)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--worker", choices=list(SCENARIOS), help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--ingest", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--concurrent", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--warmed", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--mapped", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--snapshot", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker and args.concurrent:
+        print(json.dumps(run_sessions(args.worker, args.sessions)))
+    elif args.worker:
+        print(json.dumps(run_worker(args.worker, args.trace, args.warmed, args.mapped)))
+    elif args.ingest:
+        print(json.dumps(run_ingest()))
+    elif args.snapshot:
+        print(json.dumps(run_snapshot()))
+    else:
+        report = run_suite(args.rows, args.pages, memory=not args.no_memory, sessions=args.sessions)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        else:
+            print(json.dumps(report, indent=2))
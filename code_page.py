@@ -1,42 +1,95 @@
-import streamlit as st
-import os
-
-def show():
-    st.title("🔍 Explore Our App Code")
-
-    st.markdown("""
-    Welcome to the **Code Explorer** section!  
-    Here you can view the source code behind each page of our app.  
-    Use the dropdown menu below to select a specific page and see how it was built.
-    """)
-
-    # Dictionary of page labels and corresponding file names
-    PAGE_FILES = {
-        "🏠 Homepage": "homepage.py",
-        "📊 Billionaires and Key Facts": "facts.py",
-        "📚 Learn About Our Dataset": "dataset.py",
-        "🧑‍💻 Explore Our Analysis Code": "code_page.py",
-        "💰 Global Billionaire Statistics": "starts.py",
-    }
-
-    # Dropdown to select which page's code to view
-    page_choice = st.selectbox(
-        "👇 Select a page to view its source code:",
-        options=list(PAGE_FILES.keys()),
-        index=0
-    )
-
-    file_path = PAGE_FILES[page_choice]
-
-    # Display code content or error if not found
-    with st.container():
-        if os.path.exists(file_path):
-            st.success(f"📄 Showing source code from: `{file_path}`")
-            with open(file_path, "r", encoding="utf-8") as f:
-                code = f.read()
-            with st.expander("🔐 Click to show/hide the code", expanded=True):
-                st.code(code, language="python")
-        else:
-            st.error(f"⚠️ File '{file_path}' not found. Please check if it exists.")
-
-
+import streamlit as st
+import os
+
+import profiler
+import registry
+
+# Profile results kept for the session: {"file": ..., "result": ...}
+PROFILE_KEY = "code_profile"
+
+
+@st.cache_data(show_spinner=False)
+def _read_source(file_path, mtime_ns):
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def read_source(file_path):
+    # Cached per file modification time; None when the file does not exist
+    if not os.path.exists(file_path):
+        return None
+    return _read_source(file_path, os.stat(file_path).st_mtime_ns)
+
+
+def show():
+    st.title("🔍 Explore Our App Code")
+
+    st.markdown("""
+    Welcome to the **Code Explorer** section!  
+    Here you can view the source code behind each page of our app.  
+    Use the dropdown menu below to select a specific page and see how it was built.
+    """)
+
+    # Dictionary of page labels and corresponding file names
+    PAGE_FILES = {
+        "🏠 Homepage": "homepage.py",
+        "📊 Billionaires and Key Facts": "facts.py",
+        "📚 Learn About Our Dataset": "dataset.py",
+        "🧑‍💻 Explore Our Analysis Code": "code_page.py",
+        "💰 Global Billionaire Statistics": "starts.py",
+        "⚖️ Wealth Inequality": "inequality_page.py",
+    }
+    # File name -> page registry key, for profiling
+    PAGE_KEYS = {f"{module}.py": key for key, (_, module) in registry.PAGES.items()}
+
+    # Dropdown to select which page's code to view
+    page_choice = st.selectbox(
+        "👇 Select a page to view its source code:",
+        options=list(PAGE_FILES.keys()),
+        index=0
+    )
+
+    file_path = PAGE_FILES[page_choice]
+
+    # Display code content or error if not found
+    with st.container():
+        code = read_source(file_path)
+        if code is not None:
+            st.success(f"📄 Showing source code from: `{file_path}`")
+
+            # === Profiler ===
+            if st.button("⏱️ Profile this page", help="Render this page's default view once under cProfile, tracemalloc and a line counter."):
+                with st.spinner("Profiling…"):
+                    result = profiler.profile_page(PAGE_KEYS[file_path])
+                if result is None:
+                    st.warning("Another profile is running. Try again in a moment.")
+                else:
+                    st.session_state[PROFILE_KEY] = {"file": file_path, "result": result}
+
+            profile = st.session_state.get(PROFILE_KEY)
+            result = profile["result"] if profile and profile["file"] == file_path else None
+
+            if result is None:
+                with st.expander("🔐 Click to show/hide the code", expanded=True):
+                    st.code(code, language="python")
+            else:
+                if result["error"]:
+                    st.error(f"⚠️ The page raised {result['error']} while being profiled.")
+                st.caption(
+                    f"Default view rendered in {result['seconds'] * 1000:.0f} ms with current caches (tracing slows it down). "
+                    "The left gutter counts how often each line ran; allocations include any other "
+                    "sessions active during the run."
+                )
+                col_code, col_stats = st.columns([3, 2])
+                with col_code:
+                    with st.expander("🔐 Click to show/hide the code", expanded=True):
+                        st.code(profiler.annotate(code, result["line_hits"]), language="python")
+                with col_stats:
+                    st.markdown("**🔥 Hottest functions (own time)**")
+                    st.dataframe(result["hot"].round(2), use_container_width=True, hide_index=True)
+                    st.markdown("**⏳ Cumulative time**")
+                    st.dataframe(result["cumulative"].round(2), use_container_width=True, hide_index=True)
+                    st.markdown("**🧠 Top allocation sites**")
+                    st.dataframe(result["allocations"].round(1), use_container_width=True, hide_index=True)
+        else:
+            st.error(f"⚠️ File '{file_path}' not found. Please check if it exists.")
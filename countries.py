@@ -0,0 +1,100 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from data import concat_frames, derived
+
+# ---------------------- COUNTRY DIMENSION ----------------------
+# One row per country of residence with the billionaire count, total and
+# median net worth, joined to the bundled ISO-3 lookup so the maps send about
+# 80 features instead of one per billionaire.
+
+CODES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "country_codes.csv")
+
+# Country-level indicators repeated on every billionaire row -> dimension column
+INDICATORS = {
+    "gdp_country": "gdp",
+    "population_country": "population",
+    "cpi_country": "cpi",
+    "cpi_change_country": "cpi_change",
+    "life_expectancy_country": "life_expectancy",
+    "tax_revenue_country_country": "tax_revenue",
+    "total_tax_rate_country": "total_tax_rate",
+    "gross_tertiary_education_enrollment": "tertiary_enrollment",
+    "gross_primary_education_enrollment_country": "primary_enrollment",
+    "latitude_country": "latitude",
+    "longitude_country": "longitude",
+}
+
+
+@st.cache_data
+def load_country_codes():
+    codes = pd.read_csv(CODES_PATH, encoding="utf-8", keep_default_na=False)
+    return dict(zip(codes["country"], codes["iso3"]))
+
+
+def iso3(countries):
+    return countries.map(load_country_codes())
+
+
+@derived(columns=["country", "finalWorth"])
+def get_country_stats(df):
+    stats = (
+        df.dropna(subset=["country"])
+        .groupby("country", observed=True)["finalWorth"]
+        .agg(count="size", total_worth="sum", median_worth="median")
+        .reset_index()
+    )
+    # finalWorth is in millions of USD; the maps report billions
+    stats["total_worth"] = stats["total_worth"] / 1000
+    stats["median_worth"] = stats["median_worth"] / 1000
+    stats["country_code"] = iso3(stats["country"])
+    return stats.sort_values("count", ascending=False).reset_index(drop=True)
+
+
+# ---------------------- COUNTRY INDICATORS ----------------------
+def parse_number(values):
+    # Vectorized cleaning of strings like "$2,715,518,274,227 " or "36.6%"
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+    cleaned = values.astype("string").str.replace(r"[^0-9.\-]", "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").astype(float)
+
+
+def build_country_dimension(df):
+    # One row per country: the first non-missing value of each indicator,
+    # parsed once per country instead of once per billionaire
+    table = (
+        df.dropna(subset=["country"])
+        .groupby("country", observed=True)[list(INDICATORS)]
+        .first()
+        .rename(columns=INDICATORS)
+        .reset_index()
+    )
+    for col in INDICATORS.values():
+        table[col] = parse_number(table[col])
+    return table
+
+
+def _add_countries(table, delta):
+    # Countries seen for the first time; existing rows keep their values
+    new = build_country_dimension(delta)
+    new = new[~new["country"].isin(table["country"])]
+    return concat_frames([table, new]) if len(new) else table
+
+
+@derived(columns=["country"] + list(INDICATORS), resident=False, update=_add_countries)
+def get_country_dimension(df):
+    return build_country_dimension(df)
+
+
+def wealth_vs_economy():
+    # Country aggregates joined to the dimension table (both about 80 rows)
+    stats = get_country_stats()
+    dimension = get_country_dimension()[["country", "gdp", "population"]]
+    table = stats.merge(dimension, on="country", how="left")
+    # total_worth is in billions of USD, gdp in USD
+    table["wealth_share_gdp"] = table["total_worth"] * 1e9 / table["gdp"] * 100
+    table["per_million_people"] = table["count"] / table["population"] * 1e6
+    return table
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from data import concat_frames, derived
+
+# ---------------------- AGGREGATE CUBE ----------------------
+# Counts, sum and max of net worth for every combination of the dimensions
+# below, built once per data version. Pages answer their questions from
+# slices of this small frame instead of scanning the billionaire rows, so
+# rerun cost depends on the number of groups, not the number of people.
+# Ingested rows are aggregated on their own and merged into the cube.
+
+DIMENSIONS = ["country", "industries", "gender", "ageGroup", "selfMade"]
+MEASURE = "finalWorth"
+
+
+def build_cube(df):
+    # `valued` counts the rows that have a net worth
+    grouped = df.groupby(DIMENSIONS, dropna=False, observed=True)[MEASURE]
+    cube = grouped.agg(count="size", valued="count", sum="sum", max="max").reset_index()
+    return cube
+
+
+def merge_cubes(cube, delta):
+    # Counts and sums add up and maxima take the max, so cells merge exactly
+    merged = concat_frames([cube, build_cube(delta)])
+    grouped = merged.groupby(DIMENSIONS, dropna=False, observed=True)
+    return grouped.agg(
+        count=("count", "sum"), valued=("valued", "sum"), sum=("sum", "sum"), max=("max", "max")
+    ).reset_index()
+
+
+@derived(columns=DIMENSIONS + [MEASURE], update=merge_cubes)
+def get_cube(df):
+    return build_cube(df)
+
+
+def slice_cube(by, cube=None, **filters):
+    # Group the cube by the `by` dimensions after applying equality (scalar)
+    # or membership (list) filters, e.g. slice_cube(["gender"], country="India")
+    if cube is None:
+        cube = get_cube()
+
+    mask = np.ones(len(cube), dtype=bool)
+    for dim, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            mask &= cube[dim].isin(list(value)).to_numpy()
+        else:
+            mask &= (cube[dim] == value).to_numpy()
+    part = cube[mask]
+
+    if not by:
+        result = pd.DataFrame({
+            "count": [part["count"].sum()],
+            "valued": [part["valued"].sum()],
+            "sum": [part["sum"].sum()],
+            "max": [part["max"].max()],
+        })
+    else:
+        result = part.groupby(by, observed=True).agg(
+            count=("count", "sum"), valued=("valued", "sum"), sum=("sum", "sum"), max=("max", "max")
+        ).reset_index()
+
+    # Over the rows that have a net worth, as pandas' mean skips NaN
+    result["mean"] = result["sum"] / result["valued"]
+    return result
@@ -0,0 +1,784 @@
+import functools
+import glob
+import hashlib
+import importlib.metadata
+import importlib.util
+import io
+import json
+import os
+import platform
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import snapshot
+
+# ---------------------- SHARED DATA LAYER ----------------------
+# Every page reads the billionaires dataset through load_data(). The CSV is
+# parsed once into a canonical frame (original column names, typed columns)
+# and persisted as an Arrow IPC sidecar next to a small JSON manifest, so
+# other pages and other server processes skip CSV parsing entirely.
+#
+# New records are ingested incrementally: rows appended to the CSV and CSV
+# files dropped into DELTA_DIR are parsed on their own, appended to the frame
+# (and stored as extra sidecar segments) and bump data_version(). Derived
+# structures registered with an `update` function fold the new rows in
+# instead of being rebuilt.
+#
+# The shared frame is column-projected: a column is read from the sidecar
+# the first time a page or derived structure asks for it (load_data(columns)),
+# with numeric columns narrowed to the smallest dtype holding the same values.
+#
+# Deployments running several server processes build a shared snapshot
+# first (`python snapshot.py`): the whole compact frame and every derived
+# structure, memory-mapped by each process instead of parsed and rebuilt.
+# A process starts from it while it still describes a prefix of the data
+# and was written by the same code (source hashes and library versions),
+# and ingests anything newer on top as usual.
+
+CSV_PATH = os.environ.get("BILLIONAIRES_CSV", "Billionaires Statistics Dataset.csv")
+CACHE_DIR = os.environ.get("BILLIONAIRES_CACHE_DIR", ".cache")
+DELTA_DIR = os.environ.get("BILLIONAIRES_DELTA_DIR", "deltas")
+SNAPSHOT_DIR = os.environ.get("BILLIONAIRES_SNAPSHOT_DIR", os.path.join(CACHE_DIR, "snapshot"))
+USE_SNAPSHOT = os.environ.get("BILLIONAIRES_SNAPSHOT", "1") != "0"
+
+# Bump whenever the canonical frame changes shape so stale sidecars are rebuilt
+SCHEMA_VERSION = 4
+
+# Bytes hashed at the end of the ingested prefix to recognise a pure append
+TAIL_BYTES = 1 << 16
+# Sidecar delta segments kept before they are compacted into the base file
+MAX_SEGMENTS = 8
+# Appends remembered for derived structures that have not caught up yet
+MAX_HISTORY = 32
+
+GENDER_LABELS = {"M": "Male", "F": "Female"}
+FLAG_VALUES = {"true": True, "false": False}
+# Low-cardinality labels kept as categoricals (sorted categories) in memory
+CATEGORY_COLUMNS = [
+    "category", "country", "city", "source", "industries", "countryOfCitizenship",
+    "status", "gender", "title", "state", "residenceStateRegion",
+]
+DATE_COLUMNS = {"birthDate": "%m/%d/%Y %H:%M", "date": "%m/%d/%Y %H:%M"}
+
+# Upper (inclusive) edges of the age bands, e.g. "20,30,40,50,60" gives
+# Under 20, 21–30, ..., 61+
+AGE_EDGES = [int(edge) for edge in os.environ.get("BILLIONAIRES_AGE_EDGES", "20,30,40,50,60").split(",")]
+
+
+def age_labels(edges=AGE_EDGES):
+    labels = [f"Under {edges[0]}"]
+    labels += [f"{low + 1}–{high}" for low, high in zip(edges, edges[1:])]
+    labels.append(f"{edges[-1] + 1}+")
+    return labels
+
+
+AGE_LABELS = age_labels()
+
+# Every session shares one frame. With copy-on-write (always on from pandas
+# 3) projections, slices and renames are views, and a write copies the
+# written column instead of changing the shared data.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def age_bands(ages, edges=AGE_EDGES):
+    # Vectorized banding into an ordered categorical; missing ages stay NaN
+    bins = [-np.inf] + list(edges) + [np.inf]
+    return pd.cut(ages, bins=bins, labels=age_labels(edges), ordered=True)
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _tail_hash(path, end):
+    with open(path, "rb") as f:
+        f.seek(max(0, end - TAIL_BYTES))
+        return hashlib.sha256(f.read(min(end, TAIL_BYTES))).hexdigest()
+
+
+def _sidecar_paths(path):
+    name = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+    base = os.path.join(CACHE_DIR, name)
+    return base + ".arrow", base + ".json"
+
+
+def parse_flags(values):
+    # TRUE/FALSE cells (any case, or already bools) as a nullable boolean;
+    # empty or unrecognised cells stay missing instead of becoming True
+    text = values.astype("string").str.strip().str.lower()
+    return text.map(FLAG_VALUES).astype("boolean")
+
+
+def canonicalize(df):
+    df["finalWorth"] = pd.to_numeric(df["finalWorth"], errors="coerce")
+    df["age"] = pd.to_numeric(df["age"], errors="coerce")
+    df["selfMade"] = parse_flags(df["selfMade"])
+    df["gender"] = df["gender"].replace(GENDER_LABELS)
+    for col, fmt in DATE_COLUMNS.items():
+        df[col] = pd.to_datetime(df[col], format=fmt, errors="coerce")
+    df["ageGroup"] = age_bands(df["age"])
+
+    return df.reset_index(drop=True)
+
+
+def parse_csv(source):
+    return canonicalize(pd.read_csv(source, encoding="utf-8-sig"))
+
+
+def _as_categorical(values, categories_dtype):
+    # A column parsed with nothing in it comes back as floats, whose
+    # categories would not union with text ones
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype("category")
+    if values.cat.categories.dtype != categories_dtype:
+        values = values.cat.rename_categories(values.cat.categories.astype(categories_dtype))
+    return values
+
+
+def concat_frames(frames):
+    # Appends frames keeping the first frame's dtypes, e.g. when a small delta
+    # has an all-empty text column or categoricals with other categories.
+    # Numeric columns keep whatever dtype holds both parts.
+    out = pd.concat(frames, ignore_index=True)
+    for col in frames[0].columns:
+        dtype = frames[0][col].dtype
+        if out[col].dtype == dtype or pd.api.types.is_numeric_dtype(out[col]):
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            parts = [_as_categorical(f[col], dtype.categories.dtype) for f in frames]
+            merged = union_categoricals(parts, sort_categories=not dtype.ordered)
+            out[col] = pd.Series(merged, index=out.index)
+        else:
+            try:
+                out[col] = out[col].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+    return out
+
+
+def compact_dtypes(df):
+    # CATEGORY_COLUMNS as categoricals, and the smallest numeric dtypes holding
+    # the same values: int32 for integers in range, float32 where that is
+    # exact (ages, years), float64 otherwise
+    for col in df.columns:
+        values = df[col]
+        if col in CATEGORY_COLUMNS and not isinstance(values.dtype, pd.CategoricalDtype):
+            df[col] = values.astype("category")
+            continue
+        if pd.api.types.is_bool_dtype(values) or not pd.api.types.is_numeric_dtype(values):
+            continue
+        if values.dtype.itemsize <= 4:
+            continue
+        if pd.api.types.is_integer_dtype(values):
+            info = np.iinfo(np.int32)
+            if len(values) == 0 or (values.min() >= info.min and values.max() <= info.max):
+                df[col] = values.astype(np.int32)
+        elif pd.api.types.is_float_dtype(values):
+            narrow = values.astype(np.float32)
+            if np.array_equal(narrow.to_numpy(dtype=float), values.to_numpy(dtype=float), equal_nan=True):
+                df[col] = narrow
+    return df
+
+
+# ---------------------- SIDECAR ----------------------
+def _read_manifest(manifest_path):
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(manifest_path, manifest):
+    tmp_manifest = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_manifest, manifest_path)
+
+
+def _write_arrow(df, path):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Write to a temp file first so concurrent workers never read a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_feather(tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+def _column_bytes(df):
+    return {col: int(n) for col, n in df.memory_usage(deep=True, index=False).items()}
+
+
+def _new_manifest(path, stat, frame):
+    return {
+        "schema": SCHEMA_VERSION,
+        "age_edges": AGE_EDGES,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": _file_hash(path),
+        "tail_sha256": _tail_hash(path, stat.st_size),
+        "rows": len(frame),
+        "columns": list(frame.columns),
+        # In-memory size of every canonical column, for the projection report
+        "column_bytes": _column_bytes(frame),
+        "delta_files": {},
+        "segments": [],
+    }
+
+
+def _counted(manifest, delta):
+    manifest["rows"] += len(delta)
+    for col, n in _column_bytes(delta).items():
+        manifest["column_bytes"][col] = manifest["column_bytes"].get(col, 0) + n
+    return delta
+
+
+def _read_sidecar(sidecar_path, manifest, columns=None):
+    if columns is not None and not columns:
+        return pd.DataFrame(index=pd.RangeIndex(manifest["rows"]))
+    paths = [sidecar_path] + [os.path.join(CACHE_DIR, seg) for seg in manifest["segments"]]
+    frames = [pd.read_feather(p, columns=columns) for p in paths]
+    return concat_frames(frames) if len(frames) > 1 else frames[0]
+
+
+def _project(frame, columns):
+    return frame if columns is None else frame[list(columns)]
+
+
+def _open(path, columns=None):
+    # Frame and manifest from the sidecar while it still describes the CSV or
+    # a prefix of it, otherwise from a full parse. Only `columns` are read
+    # (all when None), unless the sidecar cannot be written: then the frame
+    # keeps every column, as nothing could be read back later.
+    stat = os.stat(path)
+    sidecar_path, manifest_path = _sidecar_paths(path)
+    manifest = _read_manifest(manifest_path)
+
+    if (
+        manifest
+        and manifest.get("schema") == SCHEMA_VERSION
+        and manifest.get("age_edges") == AGE_EDGES
+        and os.path.exists(sidecar_path)
+        and all(os.path.exists(os.path.join(CACHE_DIR, seg)) for seg in manifest["segments"])
+    ):
+        size = manifest["size"]
+        # Size and mtime match: trust the sidecar without rehashing the CSV
+        if size == stat.st_size and manifest["mtime_ns"] == stat.st_mtime_ns:
+            return _read_sidecar(sidecar_path, manifest, columns), manifest
+        # File was touched or copied: same content still reuses the sidecar
+        if size == stat.st_size and manifest["sha256"] == _file_hash(path):
+            manifest["mtime_ns"] = stat.st_mtime_ns
+            return _read_sidecar(sidecar_path, manifest, columns), manifest
+        # Rows were appended: the sidecar still covers the unchanged prefix
+        if size < stat.st_size and manifest["tail_sha256"] == _tail_hash(path, size):
+            return _read_sidecar(sidecar_path, manifest, columns), manifest
+
+    return _parsed(path, columns)
+
+
+def _parsed(path, columns=None):
+    frame = parse_csv(path)
+    manifest = _new_manifest(path, os.stat(path), frame)
+    persisted = _persist(path, manifest, frame=frame)
+    return (_project(frame, columns) if persisted else frame), manifest
+
+
+# ---------------------- INCREMENTAL INGESTION ----------------------
+def _delta_files():
+    if not os.path.isdir(DELTA_DIR):
+        return {}
+    files = {}
+    for file_path in sorted(glob.glob(os.path.join(DELTA_DIR, "*.csv"))):
+        stat = os.stat(file_path)
+        files[os.path.basename(file_path)] = [stat.st_size, stat.st_mtime_ns]
+    return files
+
+
+def _read_appended(path, manifest):
+    # Complete lines written after the ingested prefix, parsed under the CSV header
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(manifest["size"])
+        tail = f.read()
+    end = tail.rfind(b"\n") + 1
+    if end == 0:
+        # Only a partial line so far; it is picked up once it is complete
+        return None, manifest["size"]
+    return parse_csv(io.BytesIO(header + tail[:end])), manifest["size"] + end
+
+
+def _catch_up(path, manifest):
+    # Parses what was added since `manifest` and advances it. Returns the new
+    # rows as a list of frames, or None when the change is not a pure append
+    # and the dataset has to be reloaded.
+    stat = os.stat(path)
+    size = manifest["size"]
+    deltas = []
+
+    if stat.st_size < size or _tail_hash(path, size) != manifest["tail_sha256"]:
+        return None
+    if stat.st_size > size:
+        delta, consumed = _read_appended(path, manifest)
+        if delta is not None and len(delta):
+            deltas.append(_counted(manifest, delta))
+        if consumed != size:
+            manifest["size"] = consumed
+            manifest["tail_sha256"] = _tail_hash(path, consumed)
+            # Rehashed once everything is ingested, so a later touch of the
+            # file is still recognised as unchanged; a trailing partial line
+            # leaves the prefix without a whole-file hash until it completes
+            manifest["sha256"] = _file_hash(path) if consumed == stat.st_size else None
+    elif stat.st_mtime_ns != manifest["mtime_ns"] and manifest["sha256"] != _file_hash(path):
+        # Rewritten in place with the same size
+        return None
+    manifest["mtime_ns"] = stat.st_mtime_ns
+
+    applied = manifest["delta_files"]
+    for name, signature in _delta_files().items():
+        if name not in applied:
+            delta = parse_csv(os.path.join(DELTA_DIR, name))
+            if len(delta):
+                deltas.append(_counted(manifest, delta))
+            applied[name] = signature
+        elif applied[name] != signature:
+            # An ingested delta file changed and its old rows cannot be taken back
+            return None
+
+    return deltas
+
+
+def _append(frame, deltas, compact=False):
+    # Each delta keeps the row positions it occupies in the combined frame;
+    # only the columns `frame` already has are appended
+    offset = len(frame)
+    parts = [frame]
+    for delta in deltas:
+        delta.index = pd.RangeIndex(offset, offset + len(delta))
+        offset += len(delta)
+        part = delta[list(frame.columns)]
+        parts.append(compact_dtypes(part.copy()) if compact else part)
+    return concat_frames(parts)
+
+
+def _persist(path, manifest, deltas=(), frame=None):
+    # Writes `frame` as the new base file, or `deltas` as segments; returns
+    # False when the cache directory is not writable
+    sidecar_path, manifest_path = _sidecar_paths(path)
+    stem = os.path.splitext(os.path.basename(sidecar_path))[0]
+    try:
+        if frame is None and len(manifest["segments"]) + len(deltas) > MAX_SEGMENTS:
+            # Compact the base file, its segments and the new rows into one file
+            frame = concat_frames([_read_sidecar(sidecar_path, manifest)] + list(deltas))
+        if frame is not None:
+            manifest["segments"] = []
+            _write_arrow(frame.reset_index(drop=True), sidecar_path)
+            for segment in glob.glob(os.path.join(CACHE_DIR, glob.escape(stem) + ".*.arrow")):
+                os.remove(segment)
+        else:
+            for delta in deltas:
+                segment = f"{stem}.{manifest['size']}-{len(manifest['segments'])}.arrow"
+                _write_arrow(delta.reset_index(drop=True), os.path.join(CACHE_DIR, segment))
+                manifest["segments"].append(segment)
+        _write_manifest(manifest_path, manifest)
+        return True
+    except OSError:
+        # Read-only deployments still work, they just parse on every cold start
+        return False
+
+
+def _load(path, columns=None, compact=False):
+    frame, manifest = _open(path, columns)
+    if compact:
+        frame = compact_dtypes(frame.copy())
+    deltas = _catch_up(path, manifest)
+    if deltas is None:
+        frame, manifest = _parsed(path, columns)
+        if compact:
+            frame = compact_dtypes(frame.copy())
+        deltas = _catch_up(path, manifest) or []
+    if deltas:
+        frame = _append(frame, deltas, compact)
+    _persist(path, manifest, deltas)
+    return frame, manifest
+
+
+def load_frame(path=CSV_PATH, columns=None):
+    # Canonical frame for `path` with appended rows and delta files applied
+    return _load(path, columns)[0]
+
+
+class _Store:
+
+    def __init__(self, frame, manifest, version, history=(), snapshot=None):
+        self.frame = frame
+        self.manifest = manifest
+        self.version = version
+        # (version, delta frame) per ingested batch; None marks a full reload
+        self.history = list(history)[-MAX_HISTORY:]
+        self.signature = None
+        # Mapped snapshot this data started from, as version 1
+        self.snapshot = snapshot
+
+    def deltas_since(self, version):
+        # Delta frames ingested after `version`, or None if a rebuild is needed
+        newer = [delta for v, delta in self.history if v > version]
+        if len(newer) != self.version - version or any(delta is None for delta in newer):
+            return None
+        return newer
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _signature():
+    stat = os.stat(CSV_PATH)
+    return stat.st_size, stat.st_mtime_ns, json.dumps(_delta_files())
+
+
+def refresh():
+    # Current dataset, after ingesting anything appended since the last call.
+    # Raises FileNotFoundError when the dataset is missing; pages report it.
+    global _store
+    signature = _signature()
+    with _store_lock:
+        store = _store
+        if store is not None and store.signature == signature:
+            return store
+
+        # Columns are loaded on demand, so a (re)load starts from none
+        if store is None:
+            store = _from_snapshot() or _Store(*_load(CSV_PATH, [], compact=True), version=1)
+        else:
+            manifest = json.loads(json.dumps(store.manifest))
+            deltas = _catch_up(CSV_PATH, manifest)
+            if deltas is None:
+                version = store.version + 1
+                store = _Store(*_load(CSV_PATH, [], compact=True), version, store.history + [(version, None)])
+            else:
+                frame = _append(store.frame, deltas, compact=True) if deltas else store.frame
+                _persist(CSV_PATH, manifest, deltas)
+                history = store.history + [(store.version + i + 1, delta) for i, delta in enumerate(deltas)]
+                store = _Store(frame, manifest, store.version + len(deltas), history, store.snapshot)
+
+        store.signature = signature
+        _store = store
+        return store
+
+
+def _snapshot_name():
+    return os.path.splitext(os.path.basename(_sidecar_paths(CSV_PATH)[0]))[0]
+
+
+def _from_snapshot():
+    # Store started from the mapped snapshot, with anything ingested since
+    # it was built on top; None without a snapshot that still applies
+    if not USE_SNAPSHOT:
+        return None
+    snap = snapshot.open_snapshot(SNAPSHOT_DIR, _snapshot_name())
+    if snap is None or snap.meta.get("schema") != SCHEMA_VERSION or snap.meta.get("age_edges") != AGE_EDGES:
+        return None
+    code = snap.meta.get("code")
+    if not code or code != _code_fingerprint(code["modules"]):
+        # Written by other code: its pickled structures may not fit this code
+        return None
+    manifest = snap.meta["manifest"]
+    deltas = _catch_up(CSV_PATH, manifest)
+    if deltas is None:
+        # The CSV was rewritten since the build
+        return None
+    frame = snap.load(SNAPSHOT_FRAME)
+    if deltas:
+        frame = _append(frame, deltas, compact=True)
+    history = [(i + 2, delta) for i, delta in enumerate(deltas)]
+    return _Store(frame, manifest, 1 + len(deltas), history, snap)
+
+
+def _with_columns(store, columns):
+    # The store frame, after reading any of `columns` it does not hold yet
+    if all(col in store.frame.columns for col in columns):
+        return store.frame
+    with _store_lock:
+        missing = [col for col in columns if col not in store.frame.columns]
+        unknown = set(missing) - set(store.manifest["columns"])
+        if unknown:
+            raise KeyError(f"Not a dataset column: {sorted(unknown)}")
+        if missing:
+            try:
+                part = _read_sidecar(_sidecar_paths(CSV_PATH)[0], store.manifest, missing)
+            except OSError:
+                part = None
+            if part is None or len(part) != len(store.frame):
+                # The sidecar is missing or behind the store: parse everything
+                part = load_frame(CSV_PATH, missing)
+            if len(part) != len(store.frame):
+                raise RuntimeError("The dataset changed while its columns were loading")
+            part = compact_dtypes(part.set_axis(store.frame.index))
+            store.frame = pd.concat([store.frame, part], axis=1)
+        return store.frame
+
+
+def load_data(columns=None):
+    # Shared frame with only `columns` (every column when None). It is the
+    # same data for every session: use masks and slices rather than copies.
+    # Raises FileNotFoundError when the dataset is missing; pages report it.
+    store = refresh()
+    if columns is None:
+        columns = store.manifest["columns"]
+    return _with_columns(store, columns)[list(columns)]
+
+
+def read_columns(columns, rows=None):
+    # `columns` for the current rows without keeping them in the shared frame,
+    # for structures that summarize columns no page reads directly. With
+    # `rows` (row positions), only those rows, in that order: a table page or
+    # an export chunk reads a few rows of columns the page does not hold
+    store = refresh()
+    columns = list(columns)
+    if rows is not None:
+        return _read_rows(store, columns, np.asarray(rows, dtype=np.int64))
+    if all(col in store.frame.columns for col in columns):
+        return store.frame[columns]
+    try:
+        part = _read_sidecar(_sidecar_paths(CSV_PATH)[0], store.manifest, columns)
+    except OSError:
+        part = None
+    if part is None or len(part) != len(store.frame):
+        return _with_columns(store, columns)[columns]
+    return part.set_axis(store.frame.index)
+
+
+def _read_rows(store, columns, rows):
+    resident = [col for col in columns if col in store.frame.columns]
+    other = [col for col in columns if col not in store.frame.columns]
+    frame = store.frame.iloc[rows][resident]
+    if other:
+        try:
+            part = _take_sidecar(_sidecar_paths(CSV_PATH)[0], store.manifest, other, rows, len(store.frame))
+        except OSError:
+            part = None
+        if part is None:
+            part = _with_columns(store, other).iloc[rows][other]
+        frame = pd.concat([frame, part.set_axis(frame.index)], axis=1)
+    return frame[columns]
+
+
+def _take_sidecar(sidecar_path, manifest, columns, rows, total):
+    # `rows` of `columns` gathered from the memory-mapped sidecar files: only
+    # the record batches holding them are touched, and only their pages are
+    # read. None when the sidecar is behind the store
+    import pyarrow as pa
+
+    paths = [sidecar_path] + [os.path.join(CACHE_DIR, seg) for seg in manifest["segments"]]
+    picked, parts, offset = [], [], 0
+    for path in paths:
+        batches = []
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                at = np.flatnonzero((rows >= offset) & (rows < offset + batch.num_rows))
+                if len(at):
+                    picked.append(at)
+                    batches.append(batch.select(columns).take(pa.array(rows[at] - offset)))
+                offset += batch.num_rows
+            schema = reader.schema
+            if batches:
+                parts.append(pa.Table.from_batches(batches).to_pandas())
+    if offset != total:
+        return None
+    if not parts:
+        return schema.empty_table().select(columns).to_pandas()
+    part = concat_frames(parts) if len(parts) > 1 else parts[0]
+    # Back in the order of `rows`
+    return part.iloc[np.argsort(np.concatenate(picked), kind="stable")] if picked else part
+
+
+def dataset_columns():
+    # Every column of the canonical frame, resident or not
+    return list(refresh().manifest["columns"])
+
+
+def data_version():
+    # Increases whenever rows are ingested; derived caches key on it
+    return refresh().version
+
+
+def snapshot_report():
+    # The snapshot this process started from, or None
+    snap = refresh().snapshot
+    if snap is None:
+        return None
+    return {
+        "path": snap.path,
+        "built": snap.meta["built"],
+        "mapped_bytes": snap.nbytes,
+        "structures": len(snap.index) - 1,
+    }
+
+
+def column_report():
+    # Resident size of the loaded columns against the full canonical frame:
+    # what projection saves (columns never loaded, at their parsed size) and
+    # what compact dtypes save on the columns that are loaded
+    store = refresh()
+    full = store.manifest["column_bytes"]
+    loaded = int(store.frame.memory_usage(deep=True, index=False).sum())
+    resident_full = sum(n for col, n in full.items() if col in store.frame.columns)
+    return {
+        "columns_loaded": len(store.frame.columns),
+        "columns_total": len(full),
+        "loaded_bytes": loaded,
+        "full_bytes": sum(full.values()),
+        "projection_saved_bytes": sum(full.values()) - resident_full,
+        "dtype_saved_bytes": resident_full - loaded,
+        "saved_bytes": sum(full.values()) - loaded,
+    }
+
+
+# ---------------------- DERIVED STRUCTURES ----------------------
+_derived = {}
+_derived_lock = threading.Lock()
+# key -> getter of every derived structure, for the snapshot build
+_getters = {}
+
+
+def derived(build=None, *, columns=None, resident=True, update=None):
+    # Process-wide memo of a structure built from the canonical frame (only
+    # `columns` of it when given), shared by every session. With
+    # resident=False the columns are read for the build and then dropped
+    # instead of being added to the shared frame. When rows are
+    # ingested, update(value, delta) folds the delta frame (indexed by its row
+    # positions in the full frame) into the previous value instead of
+    # rebuilding; returning None forces a rebuild.
+    def decorate(build):
+        key = f"{build.__module__}.{build.__qualname__}"
+
+        # One build at a time: a caller arriving mid-build (e.g. a session
+        # during the warm-up) waits for it instead of building again
+        build_lock = threading.Lock()
+
+        @functools.wraps(build)
+        def get():
+            store = refresh()
+            with _derived_lock:
+                entry = _derived.get(key)
+            if entry is not None and entry[0] == store.version:
+                return entry[1]
+            with build_lock:
+                return _build(store)
+
+        def _build(store):
+            with _derived_lock:
+                entry = _derived.get(key)
+            if entry is None and store.snapshot is not None and key in store.snapshot:
+                # Built with the snapshot, as of its data (version 1)
+                entry = (1, store.snapshot.load(key))
+                with _derived_lock:
+                    _derived[key] = entry
+            if entry is not None and entry[0] >= store.version:
+                return entry[1]
+
+            value = None
+            if entry is not None and update is not None:
+                deltas = store.deltas_since(entry[0])
+                if deltas is not None:
+                    value = entry[1]
+                    for delta in deltas:
+                        value = update(value, delta)
+                        if value is None:
+                            break
+            if value is None:
+                wanted = store.manifest["columns"] if columns is None else columns
+                if resident:
+                    value = build(_with_columns(store, wanted)[list(wanted)])
+                else:
+                    value = build(read_columns(wanted))
+
+            with _derived_lock:
+                _derived[key] = (store.version, value)
+            return value
+
+        _getters[key] = get
+        return get
+
+    return decorate(build) if build is not None else decorate
+
+
+def append_segment(segment, wrap):
+    # update= for a structure kept as a list of per-segment builds: the
+    # delta becomes one more segment(delta, offset=first row) and
+    # wrap(segments) the new value, until MAX_SEGMENTS forces a rebuild
+    def update(value, delta):
+        if len(value.segments) >= MAX_SEGMENTS:
+            return None
+        return wrap(value.segments + [segment(delta, offset=delta.index[0])])
+
+    return update
+
+
+def registered():
+    # key -> getter of every derived structure registered so far
+    return dict(_getters)
+
+
+# ---------------------- SNAPSHOT BUILD ----------------------
+SNAPSHOT_FRAME = "frame"
+# Libraries whose objects are pickled into the snapshot
+SNAPSHOT_LIBRARIES = ("numpy", "pandas", "pyarrow")
+
+
+def _library_version(name):
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _source_hash(module):
+    spec = importlib.util.find_spec(module)
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return None
+    with open(spec.origin, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _code_fingerprint(modules):
+    # Source hash of each module whose classes the snapshot pickles, and
+    # the Python and library versions: a snapshot only loads into the same
+    # code. Modules are hashed from their files, without importing them.
+    return {
+        "python": platform.python_version(),
+        "libraries": {name: _library_version(name) for name in SNAPSHOT_LIBRARIES},
+        "modules": {module: _source_hash(module) for module in sorted(modules)},
+    }
+
+
+def write_snapshot():
+    # Writes the current data (every column) and every derived structure
+    # registered so far as the shared snapshot of CSV_PATH; returns its data
+    # file. Pages register their structures when imported.
+    store = refresh()
+    objects = {SNAPSHOT_FRAME: load_data()}
+    for key, get in registered().items():
+        objects[key] = get()
+    if refresh().version != store.version:
+        raise RuntimeError("The dataset changed while the snapshot was building")
+    # This module, snapshot.py and every module defining a derived structure
+    modules = {__name__, snapshot.__name__} | {key.rsplit(".", 1)[0] for key in objects if key != SNAPSHOT_FRAME}
+    meta = {
+        "schema": SCHEMA_VERSION,
+        "age_edges": AGE_EDGES,
+        "built": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "code": _code_fingerprint(modules),
+        "manifest": store.manifest,
+    }
+    return snapshot.write(SNAPSHOT_DIR, _snapshot_name(), objects, meta)
@@ -1,143 +1,268 @@
-import streamlit as st
-import pandas as pd
-import os
-
-def show():
-    st.subheader("Business IT 2 | Python 2")
-
-    # === Custom Styling ===
-    st.markdown("""
-        <style>
-        .custom-title {
-            color: black;
-            font-weight: bold;
-            font-size: 50px;
-            margin-bottom: 0px;
-        }
-        .custom-line {
-            border-bottom: 5px solid #fbc02d;
-            margin-top: 5px;
-            margin-bottom: 25px;
-            width: 100%;
-        }
-        </style>
-    """, unsafe_allow_html=True)
-
-    st.markdown('<div class="custom-title">Billionaires Statistics Dataset (2023)</div>', unsafe_allow_html=True)
-
-    # === Introduction ===
-    with st.expander("📘 How to Use This App", expanded=False):
-        st.markdown("""
-        - This app displays insights from the 2023 Billionaires dataset.
-        - Use the **Filter Options** below to explore data based on country, net worth, and industry.
-        - You can select multiple values in each filter. The table updates automatically.
-        - If no data appears, try widening your filter range.
-        """)
-
-    st.write("### Dataset Overview")
-    st.write(
-        "This dataset contains information on global billionaires in 2023, including their rank, net worth (in USD billions), age, country of citizenship, source of wealth, and industry. "
-        "It provides valuable insights into wealth distribution, industry trends, and geographic concentrations of ultra-high net worth individuals."
-    )
-
-    # === Dataset Variables ===
-    st.write("### Dataset Variables 📝")
-    st.markdown('<div class="custom-line"></div>', unsafe_allow_html=True)
-    st.markdown("**1. `rank`**: Billionaire's rank in 2023 by net worth on Forbes list.")
-    st.markdown("**2. `name`**: Full name of the billionaire.")
-    st.markdown("**3. `net_worth`**: Net worth in USD billions.")
-    st.markdown("**4. `age`**: Age of the billionaire in 2023.")
-    st.markdown("**5. `country`**: Country of citizenship.")
-    st.markdown("**6. `source`**: Primary source of wealth (e.g., Technology, Finance, Retail).")
-    st.markdown("**7. `industry`**: Industry sector associated with the billionaire's wealth.")
-
-    # === Load Dataset ===
-    st.subheader("Preview and Filter Data")
-
-    @st.cache_data
-    def load_data():
-        file_path = os.path.join(os.getcwd(), "Billionaires Statistics Dataset.csv")
-        return pd.read_csv(file_path)
-
-    try:
-        df = load_data()
-    except FileNotFoundError:
-        st.error("Could not find the dataset file 'Billionaires Statistics Dataset.csv'. Make sure it is in the app directory.")
-        return
-
-    # === Preprocessing ===
-    df.columns = [col.strip().lower() for col in df.columns]
-    wealth_cols = ['net_worth', 'networth', 'finalworth', 'finalworth']
-    for col in wealth_cols:
-        if col in df.columns:
-            df = df.rename(columns={col: 'net_worth'})
-            break
-
-    if 'industry' not in df.columns:
-        if 'source' in df.columns:
-            df = df.rename(columns={'source': 'industry'})
-        else:
-            df['industry'] = 'Unknown'
-
-    df['country'] = df['country'].fillna('Unknown')
-    df['industry'] = df['industry'].fillna('Unknown')
-
-    # === Preview ===
-    st.write("#### Data Preview (First 5 Rows)")
-    st.dataframe(df.head(5), use_container_width=True)
-
-    # === Filter UI ===
-    st.write("---")
-    st.write("Use the filter options below to explore specific subsets of billionaires based on their country, net worth, and industry.")
-    
-    with st.expander("🔍 Filter Options", expanded=False):
-        # Country filter
-        countries = sorted(df['country'].unique())
-        sel_countries = st.multiselect(
-            "🌍 Select Country (searchable):",
-            options=countries,
-            default=countries[:10],
-            help="Select one or more countries to see billionaires holding that nationality."
-        )
-
-        # Net worth slider
-        min_w, max_w = float(df['net_worth'].min()), float(df['net_worth'].max())
-        sel_range = st.slider(
-            "💰 Select Net Worth Range (in billion USD):",
-            min_value=min_w,
-            max_value=max_w,
-            value=(min_w, max_w),
-            step=0.5,
-            help="Adjust to include only billionaires whose net worth falls within this range."
-        )
-
-        # Industry filter
-        industries = sorted(df['industry'].unique())
-        sel_industries = st.multiselect(
-            "🏭 Select Industry:",
-            options=industries,
-            default=industries[:8],
-            help="Choose industries that represent the primary wealth sector of the billionaires."
-        )
-
-    # === Filtering ===
-    df_filtered = df[
-        df['country'].isin(sel_countries) &
-        df['net_worth'].between(sel_range[0], sel_range[1]) &
-        df['industry'].isin(sel_industries)
-    ]
-
-    if df_filtered.empty:
-        st.warning("No records found. Try adjusting the filters.")
-    else:
-        st.write(f"**Filtered records:** {len(df_filtered)}")
-        st.dataframe(df_filtered, use_container_width=True)
-
-    # === Optional Chart ===
-    if st.checkbox("📊 Show industry distribution chart"):
-        st.bar_chart(df_filtered['industry'].value_counts())
-
-    st.write("---")
-    st.caption("Use the filters above (🔍) to explore billionaire characteristics by country, wealth, and industry.")
-
-
+import streamlit as st
+
+import perf
+from data import dataset_columns, load_data, read_columns
+from export import FORMATS, MAX_EXPORT_ROWS, export_file
+from figures import top_categories
+from filter_index import get_filter_index
+from results import cached_result, quantize_range
+from search import get_search_index
+
+# Table sort options: label -> column of the canonical frame
+SORT_OPTIONS = {
+    "rank": "rank",
+    "net_worth": "finalWorth",
+    "personname": "personName",
+    "age": "age",
+    "country": "country",
+    "industry": "industries",
+}
+PAGE_SIZES = [25, 50, 100, 250]
+RANGE_STEP = 0.5
+# Held in the shared frame: the variables described on the page, which the
+# table sorts and filters on. Every other column is read for just the rows
+# on screen or being exported
+PAGE_COLUMNS = ["rank", "personName", "finalWorth", "age", "country", "source", "industries"]
+# Shown under these names; every other column in lower case
+DISPLAY_NAMES = {'finalWorth': 'net_worth', 'industries': 'industry', 'personName': 'personname'}
+# Searched field -> label shown next to a match
+FIELD_LABELS = {'personName': 'name', 'organization': 'organization', 'source': 'source'}
+
+
+def display_name(col):
+    return DISPLAY_NAMES.get(col, col.lower())
+
+
+def displayed(rows):
+    # Display names and 'Unknown' labels for just the rows on screen; the
+    # shared frame itself is never renamed or filled
+    rows = rows.rename(columns=display_name)
+    rows['country'] = rows['country'].astype(object).fillna('Unknown')
+    rows['industry'] = rows['industry'].astype(object).fillna('Unknown')
+    return rows
+
+
+def show():
+    st.subheader("Business IT 2 | Python 2")
+
+    # === Custom Styling ===
+    st.markdown("""
+        <style>
+        .custom-title {
+            color: black;
+            font-weight: bold;
+            font-size: 50px;
+            margin-bottom: 0px;
+        }
+        .custom-line {
+            border-bottom: 5px solid #fbc02d;
+            margin-top: 5px;
+            margin-bottom: 25px;
+            width: 100%;
+        }
+        </style>
+    """, unsafe_allow_html=True)
+
+    st.markdown('<div class="custom-title">Billionaires Statistics Dataset (2023)</div>', unsafe_allow_html=True)
+
+    # === Introduction ===
+    with st.expander("📘 How to Use This App", expanded=False):
+        st.markdown("""
+        - This app displays insights from the 2023 Billionaires dataset.
+        - Use the **Filter Options** below to explore data based on country, net worth, and industry.
+        - You can select multiple values in each filter. The table updates automatically.
+        - If no data appears, try widening your filter range.
+        """)
+
+    st.write("### Dataset Overview")
+    st.write(
+        "This dataset contains information on global billionaires in 2023, including their rank, net worth (in USD billions), age, country of citizenship, source of wealth, and industry. "
+        "It provides valuable insights into wealth distribution, industry trends, and geographic concentrations of ultra-high net worth individuals."
+    )
+
+    # === Dataset Variables ===
+    st.write("### Dataset Variables 📝")
+    st.markdown('<div class="custom-line"></div>', unsafe_allow_html=True)
+    st.markdown("**1. `rank`**: Billionaire's rank in 2023 by net worth on Forbes list.")
+    st.markdown("**2. `name`**: Full name of the billionaire.")
+    st.markdown("**3. `net_worth`**: Net worth in USD billions.")
+    st.markdown("**4. `age`**: Age of the billionaire in 2023.")
+    st.markdown("**5. `country`**: Country of citizenship.")
+    st.markdown("**6. `source`**: Primary source of wealth (e.g., Technology, Finance, Retail).")
+    st.markdown("**7. `industry`**: Industry sector associated with the billionaire's wealth.")
+
+    # === Load Dataset ===
+    st.subheader("Preview and Filter Data")
+
+    # Every column is shown and exported, but only PAGE_COLUMNS are kept in
+    # the shared frame; the filter and search indexes read the columns they index
+    try:
+        with perf.section("load_data"):
+            df = load_data(PAGE_COLUMNS)
+            columns = dataset_columns()
+    except FileNotFoundError:
+        st.error("Could not find the dataset file 'Billionaires Statistics Dataset.csv'. Make sure it is in the app directory.")
+        return
+
+    # === Preview ===
+    st.write("#### Data Preview (First 5 Rows)")
+    st.dataframe(displayed(read_columns(columns, range(min(5, len(df))))), use_container_width=True)
+
+    # === Filter UI ===
+    with perf.section("filter_index"):
+        index = get_filter_index()
+    st.write("---")
+    st.write("Use the filter options below to explore specific subsets of billionaires based on their country, net worth, and industry.")
+
+    # === Search ===
+    # Trigram index over distinct names, organizations and sources; the
+    # matching rows narrow the filter selection below
+    query = st.text_input(
+        "🔎 Search by name, organization or source:",
+        placeholder="e.g. Arnault, Walmart, Tesla",
+        help="Matches whole words, word starts and parts of names; close spellings are tried when nothing matches."
+    ).strip()
+    search_rows = None
+    if query:
+        with perf.section("search"):
+            matches, search_rows = cached_result(
+                "search", {"query": query.lower()}, lambda: get_search_index().search(query)
+            )
+        if len(search_rows) == 0:
+            st.caption(f"No billionaire, organization or source matches “{query}”.")
+        else:
+            best = ", ".join(f"{value} ({FIELD_LABELS[field]})" for field, value in zip(matches["field"].head(5), matches["value"].head(5)))
+            noun = "billionaire matches" if len(search_rows) == 1 else "billionaires match"
+            st.caption(f"{len(search_rows)} {noun} “{query}”. Best matches: {best}")
+
+    with st.expander("🔍 Filter Options", expanded=False):
+        # Country filter
+        countries = index.categories['country']
+        sel_countries = st.multiselect(
+            "🌍 Select Country (searchable):",
+            options=countries,
+            default=countries[:10],
+            help="Select one or more countries to see billionaires holding that nationality."
+        )
+
+        # Net worth slider
+        min_w, max_w = index.value_bounds()
+        sel_range = st.slider(
+            "💰 Select Net Worth Range (in billion USD):",
+            min_value=min_w,
+            max_value=max_w,
+            value=(min_w, max_w),
+            step=RANGE_STEP,
+            help="Adjust to include only billionaires whose net worth falls within this range."
+        )
+
+        # Industry filter
+        industries = index.categories['industries']
+        sel_industries = st.multiselect(
+            "🏭 Select Industry:",
+            options=industries,
+            default=industries[:8],
+            help="Choose industries that represent the primary wealth sector of the billionaires."
+        )
+
+    # === Filtering ===
+    # Bitmap OR/AND over the load-time index instead of string comparisons,
+    # shared across sessions with the same canonical filter state
+    state = {
+        "countries": set(sel_countries),
+        "industries": set(sel_industries),
+        "range": quantize_range(sel_range, RANGE_STEP, (min_w, max_w)),
+        "query": query.lower(),
+    }
+
+    def build_selection():
+        result = index.select(
+            {'country': state["countries"], 'industries': state["industries"]},
+            value_range=state["range"],
+            rows=search_rows
+        )
+        return result, result.count()
+
+    with perf.section("filter"):
+        selection, total = cached_result("selection", state, build_selection)
+
+    if total == 0:
+        if search_rows is not None and len(search_rows):
+            st.warning("None of the search matches pass the current filters. Try widening the filter options.")
+        else:
+            st.warning("No records found. Try adjusting the filters.")
+    else:
+        if search_rows is not None:
+            st.write(f"**Filtered records:** {total} of {len(search_rows)} search matches")
+        else:
+            st.write(f"**Filtered records:** {total}")
+
+        # Only the requested page of the result is sorted, sliced and sent
+        col_sort, col_order, col_size, col_page = st.columns(4)
+        with col_sort:
+            sort_label = st.selectbox("↕️ Sort by:", options=list(SORT_OPTIONS.keys()), index=0)
+        with col_order:
+            order = st.radio("Order:", ["Ascending", "Descending"], index=0, horizontal=True)
+        with col_size:
+            page_size = st.selectbox("Rows per page:", options=PAGE_SIZES, index=1)
+        n_pages = (total + page_size - 1) // page_size
+        with col_page:
+            page_number = st.number_input("Page:", min_value=1, max_value=n_pages, value=1, step=1)
+
+        start = (int(page_number) - 1) * page_size
+        with perf.section("table"):
+            window = {"sort": sort_label, "order": order, "start": start, "stop": start + page_size}
+            rows = cached_result("window", {**state, **window}, lambda: selection.window(
+                start, start + page_size,
+                sort_column=SORT_OPTIONS[sort_label],
+                descending=order == "Descending"
+            ))
+            st.dataframe(displayed(read_columns(columns, rows)), use_container_width=True)
+        st.caption(f"Showing rows {start + 1}–{start + len(rows)} of {total} (page {int(page_number)} of {n_pages}).")
+
+        # === Export ===
+        # Built only when the button is clicked, from the same selection and
+        # order as the table, and written a chunk of rows at a time; the first
+        # MAX_EXPORT_ROWS rows in that order when the selection is larger
+        with st.expander("⬇️ Export filtered rows", expanded=False):
+            export_format = st.radio("Format:", list(FORMATS), horizontal=True)
+            export_columns = st.multiselect(
+                "Columns:",
+                options=columns,
+                default=columns,
+                format_func=display_name
+            )
+            sort_column, descending = SORT_OPTIONS[sort_label], order == "Descending"
+            exported = min(total, MAX_EXPORT_ROWS)
+            if exported < total:
+                st.caption(
+                    f"Exports are limited to {MAX_EXPORT_ROWS:,} rows, as the file is held in memory until "
+                    f"it is downloaded: this one has the first {exported:,} of {total:,} rows in the table's order. "
+                    "Narrow the filters to export the rest."
+                )
+
+            def build_export():
+                ordered = selection.window(0, exported, sort_column=sort_column, descending=descending)
+                names = {col: display_name(col) for col in export_columns}
+                return export_file(read_columns, ordered, export_columns, export_format, names)
+
+            extension, mime = FORMATS[export_format]
+            st.download_button(
+                f"Download {exported} rows as {export_format}",
+                data=build_export,
+                file_name=f"billionaires_filtered.{extension}",
+                mime=mime,
+                on_click="ignore",
+                disabled=not export_columns
+            )
+
+    # === Optional Chart ===
+    if st.checkbox("📊 Show industry distribution chart"):
+        with perf.section("industry_chart"):
+            counts = cached_result("industry_counts", state, lambda: top_categories(selection.value_counts('industries')))
+            st.bar_chart(counts)
+
+    st.write("---")
+    st.caption("Use the filters above (🔍) to explore billionaire characteristics by country, wealth, and industry.")
+
+
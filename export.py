@@ -0,0 +1,61 @@
+import os
+import tempfile
+
+# ---------------------- STREAMING EXPORT ----------------------
+# Selected rows are written to a temporary file CHUNK_ROWS at a time: only
+# one chunk is read (e.g. data.read_columns, which takes columns the shared
+# frame does not hold from the sidecar) and encoded at once, never the
+# whole result as one DataFrame or one CSV string. st.download_button keeps
+# the finished file in memory until it is downloaded, so an export holds at
+# most MAX_EXPORT_ROWS rows; pages say so next to the button.
+
+CHUNK_ROWS = 50_000
+MAX_EXPORT_ROWS = int(os.environ.get("BILLIONAIRES_MAX_EXPORT_ROWS", "100000"))
+# label -> (file extension, MIME type)
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def chunks(read, rows, columns, chunk_rows=CHUNK_ROWS):
+    # Frames of `rows` (positions, in output order) and `columns`, each from
+    # read(columns, rows)
+    for start in range(0, max(len(rows), 1), chunk_rows):
+        yield read(columns, rows[start:start + chunk_rows])
+
+
+def write_csv(frames, f):
+    # Each chunk is encoded as one string: a few MB, and much faster than
+    # pandas writing row by row into a text wrapper
+    for i, frame in enumerate(frames):
+        f.write(frame.to_csv(header=i == 0, index=False).encode("utf-8"))
+
+
+def write_parquet(frames, f):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # One row group per chunk, all with the first chunk's schema
+    writer = None
+    for frame in frames:
+        table = pa.Table.from_pandas(frame, schema=writer.schema if writer else None, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(f, table.schema)
+        writer.write_table(table)
+    writer.close()
+
+
+WRITERS = {"CSV": write_csv, "Parquet": write_parquet}
+
+
+def export_file(read, rows, columns, fmt, names=None, chunk_rows=CHUNK_ROWS):
+    # Bytes of `rows` in `fmt`; `names` renames columns in the output.
+    # The temporary file is closed (and removed) before returning
+    if len(rows) > MAX_EXPORT_ROWS:
+        raise ValueError(f"Exports hold at most {MAX_EXPORT_ROWS} rows, not {len(rows)}")
+    frames = (frame.rename(columns=names or {}) for frame in chunks(read, rows, columns, chunk_rows))
+    with tempfile.TemporaryFile() as f:
+        WRITERS[fmt](frames, f)
+        f.seek(0)
+        return f.read()
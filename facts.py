@@ -1,150 +1,225 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from streamlit_extras.colored_header import colored_header
-from annotated_text import annotated_text
-import os
-import base64  # Missing import
-
-# ---------------------- DATA LOADING & PROCESSING ----------------------
-@st.cache_data
-def load_data():
-    file_path = "Billionaires Statistics Dataset.csv"
-    if not os.path.exists(file_path):
-        return None
-
-    df = pd.read_csv(file_path)
-    df = df.dropna(subset=['country'])
-
-    country_info = {
-        'country_code': ['USA', 'CHN', 'IND', 'GER', 'BRA', 'FRA', 'JPN', 'CAN', 'RUS', 'GBR'],
-        'country': ['United States', 'China', 'India', 'Germany', 'Brazil', 'France', 'Japan', 'Canada', 'Russia', 'United Kingdom']
-    }
-    country_df = pd.DataFrame(country_info)
-    df = df.merge(country_df, on='country', how='left')
-
-    count_df = df['country'].value_counts().reset_index()
-    count_df.columns = ['country', 'Billionaire_Count']
-    df = df.merge(count_df, on='country', how='left')
-
-    if 'finalWorth' in df.columns:
-        df['finalWorth'] = pd.to_numeric(df['finalWorth'], errors='coerce').fillna(0)
-    else:
-        df['finalWorth'] = 0
-
-    return df
-
-# ---------------------- PAGE LAYOUT & VISUALIZATION ----------------------
-def show():
-    st.markdown("""
-        <style>
-            h1, .stTitle, .stSubheader {
-                color: #140f00 !important;
-            }
-            .custom-header {
-                font-size: 24px;
-                font-weight: bold;
-                color: #140f00;
-                margin: 10px 0 5px 0;
-            }
-            .custom-subtitle {
-                font-size: 18px;
-                font-weight: bold;
-                margin: 0 0 10px 0;
-            }
-            hr.custom-hr {
-                border: 2px solid gold;
-                margin: 10px 0;
-            }
-        </style>
-    """, unsafe_allow_html=True)
-
-    st.subheader("Business IT 2 | Python 2")
-    st.title("Billionaires Statistics - 2023")
-    st.markdown("### 🌟 Top 3 Richest Billionaires in 2023")
-
-    billionaires = [
-        {"name": "Jeff Bezos", "net_worth": "$160B", "image": "jeff_bezos.jpg"},
-        {"name": "Elon Musk", "net_worth": "$250B", "image": "elon_musk.jpg"},
-        {"name": "Bernard Arnault", "net_worth": "$220B", "image": "bernard_arnault.jpg"}
-    ]
-
-    col1, col2, col3 = st.columns(3)
-    for i, b in enumerate(billionaires):
-        with [col1, col2, col3][i]:  # Proper indentation
-            if os.path.exists(b["image"]):
-                st.markdown(
-                    f"""
-                    <div style='text-align: center;'>
-                        <img src="data:image/jpeg;base64,{base64.b64encode(open(b["image"], "rb").read()).decode()}"
-                             style="width:200px; height:250px; object-fit:cover; border-radius:12px;" />
-                        <p style="margin-top: 8px; font-size: 16px; color: gray;">{b['name']} – {b['net_worth']}</p>
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
-            else:
-                st.warning(f"Image not found: {b['image']}")
-
-    colored_header("An introduction 💡", "Overview of Billionaires around the world in 2023", color_name="yellow-70")
-
-    annotated_text(
-        ("Billionaires", "💸", "#FFC200"),
-        ", are individuals whose net worth exceeds 1 billion USD. Despite global economic challenges, the billionaire population grew significantly in 2023.",
-        ("Country-wise", "🌍", "#FFC200"),
-        ", the data shows how wealth is distributed around the world."
-    )
-
-    annotated_text(
-        "The United States remains the leader in billionaire count, followed by China. "
-        "Many emerging economies are also witnessing a rise in billionaires. "
-        "Major industries include technology, finance, and healthcare."
-    )
-
-    colored_header("The Billionaire Economy 💰", "Understanding global billionaire distribution and wealth in 2023", color_name="yellow-70")
-    st.write("In 2023, global billionaire wealth became more diverse. While still led by the US and China, more countries are now home to ultra-wealthy individuals.")
-    annotated_text("More than 2,700 billionaires around the world have a combined net worth in the trillions of dollars, spanning industries like tech and healthcare.")
-
-    df = load_data()
-    if df is None:
-        st.error("❌ Dataset file 'Billionaires Statistics Dataset.csv' not found.")
-        return
-
-    st.markdown("<div class='custom-header'>Billionaires by Country (2023)</div>", unsafe_allow_html=True)
-    st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
-    st.markdown("<div class='custom-subtitle'>Billionaire Count by Country</div>", unsafe_allow_html=True)
-
-    fig_count = px.choropleth(
-        df,
-        locations='country_code',
-        locationmode="ISO-3",
-        color='Billionaire_Count',
-        color_continuous_scale="YlOrBr",
-        labels={'Billionaire_Count': 'Number of Billionaires'},
-        hover_name='country',
-        hover_data=["country", "Billionaire_Count"]
-    )
-    st.plotly_chart(fig_count)
-    st.caption("📺 This map shows the number of billionaires per country (2023).")
-
-    st.markdown("<div class='custom-header' style='margin-top: 30px;'>Billionaire Net Worth by Country</div>", unsafe_allow_html=True)
-    st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
-    st.markdown("<div class='custom-subtitle'>Billionaire Net Worth Distribution (2023)</div>", unsafe_allow_html=True)
-
-    fig_wealth = px.choropleth(
-        df,
-        locations='country_code',
-        locationmode="ISO-3",
-        color='finalWorth',
-        color_continuous_scale="YlOrBr",
-        labels={'finalWorth': 'Net Worth (in Billion USD)'},
-        hover_name='country',
-        hover_data=["country", "finalWorth"]
-    )
-    st.plotly_chart(fig_wealth)
-    st.caption("🌎 This map displays the total billionaire net worth per country in 2023.")
-
-# ---------------------- RUN APP ----------------------
-if __name__ == "__main__":
-    show()
-
+import streamlit as st
+import plotly.express as px
+from streamlit_extras.colored_header import colored_header
+from annotated_text import annotated_text
+
+import perf
+from assets import image_data_uri
+from countries import get_country_stats, wealth_vs_economy
+from figures import cached_figure
+from geo_grid import REGIONS, RESOLUTIONS, bin_size, bins
+
+# Wealth vs economy view: label -> column of countries.wealth_vs_economy()
+ECONOMY_METRICS = {
+    "Wealth as % of GDP": "wealth_share_gdp",
+    "Billionaires per million people": "per_million_people",
+}
+ECONOMY_TOP_N = 20
+
+# ---------------------- DATA LOADING & PROCESSING ----------------------
+def load_map_data():
+    # One row per country (count, total and median worth), cached per data version
+    try:
+        return get_country_stats()
+    except FileNotFoundError:
+        return None
+
+# ---------------------- PAGE LAYOUT & VISUALIZATION ----------------------
+def show():
+    st.markdown("""
+        <style>
+            h1, .stTitle, .stSubheader {
+                color: #140f00 !important;
+            }
+            .custom-header {
+                font-size: 24px;
+                font-weight: bold;
+                color: #140f00;
+                margin: 10px 0 5px 0;
+            }
+            .custom-subtitle {
+                font-size: 18px;
+                font-weight: bold;
+                margin: 0 0 10px 0;
+            }
+            hr.custom-hr {
+                border: 2px solid gold;
+                margin: 10px 0;
+            }
+        </style>
+    """, unsafe_allow_html=True)
+
+    st.subheader("Business IT 2 | Python 2")
+    st.title("Billionaires Statistics - 2023")
+    st.markdown("### 🌟 Top 3 Richest Billionaires in 2023")
+
+    billionaires = [
+        {"name": "Jeff Bezos", "net_worth": "$160B", "image": "jeff_bezos.jpg"},
+        {"name": "Elon Musk", "net_worth": "$250B", "image": "elon_musk.jpg"},
+        {"name": "Bernard Arnault", "net_worth": "$220B", "image": "bernard_arnault.jpg"}
+    ]
+
+    col1, col2, col3 = st.columns(3)
+    for i, b in enumerate(billionaires):
+        with [col1, col2, col3][i]:  # Proper indentation
+            with perf.section("portrait"):
+                uri = image_data_uri(b["image"], 200, 250)
+            if uri is not None:
+                st.markdown(
+                    f"""
+                    <div style='text-align: center;'>
+                        <img src="{uri}"
+                             style="width:200px; height:250px; object-fit:cover; border-radius:12px;" />
+                        <p style="margin-top: 8px; font-size: 16px; color: gray;">{b['name']} – {b['net_worth']}</p>
+                    </div>
+                    """,
+                    unsafe_allow_html=True
+                )
+            else:
+                st.warning(f"Image not found: {b['image']}")
+
+    colored_header("An introduction 💡", "Overview of Billionaires around the world in 2023", color_name="yellow-70")
+
+    annotated_text(
+        ("Billionaires", "💸", "#FFC200"),
+        ", are individuals whose net worth exceeds 1 billion USD. Despite global economic challenges, the billionaire population grew significantly in 2023.",
+        ("Country-wise", "🌍", "#FFC200"),
+        ", the data shows how wealth is distributed around the world."
+    )
+
+    annotated_text(
+        "The United States remains the leader in billionaire count, followed by China. "
+        "Many emerging economies are also witnessing a rise in billionaires. "
+        "Major industries include technology, finance, and healthcare."
+    )
+
+    colored_header("The Billionaire Economy 💰", "Understanding global billionaire distribution and wealth in 2023", color_name="yellow-70")
+    st.write("In 2023, global billionaire wealth became more diverse. While still led by the US and China, more countries are now home to ultra-wealthy individuals.")
+    annotated_text("More than 2,700 billionaires around the world have a combined net worth in the trillions of dollars, spanning industries like tech and healthcare.")
+
+    with perf.section("country_stats"):
+        df = load_map_data()
+    if df is None:
+        st.error("❌ Dataset file 'Billionaires Statistics Dataset.csv' not found.")
+        return
+
+    st.markdown("<div class='custom-header'>Billionaires by Country (2023)</div>", unsafe_allow_html=True)
+    st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
+    st.markdown("<div class='custom-subtitle'>Billionaire Count by Country</div>", unsafe_allow_html=True)
+
+    def build_count_map():
+        fig_count = px.choropleth(
+            df,
+            locations='country_code',
+            locationmode="ISO-3",
+            color='count',
+            color_continuous_scale="YlOrBr",
+            labels={'count': 'Number of Billionaires'},
+            hover_name='country',
+            hover_data={'country_code': False, 'count': True}
+        )
+        return fig_count
+
+    with perf.section("count_map"):
+        fig_count = cached_figure("country_count_map", None, build_count_map)
+        st.plotly_chart(fig_count)
+    st.caption("📺 This map shows the number of billionaires per country (2023).")
+
+    st.markdown("<div class='custom-header' style='margin-top: 30px;'>Billionaire Net Worth by Country</div>", unsafe_allow_html=True)
+    st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
+    st.markdown("<div class='custom-subtitle'>Billionaire Net Worth Distribution (2023)</div>", unsafe_allow_html=True)
+
+    def build_wealth_map():
+        fig_wealth = px.choropleth(
+            df,
+            locations='country_code',
+            locationmode="ISO-3",
+            color='total_worth',
+            color_continuous_scale="YlOrBr",
+            labels={
+                'total_worth': 'Total Net Worth (in Billion USD)',
+                'median_worth': 'Median Net Worth (in Billion USD)',
+                'count': 'Number of Billionaires'
+            },
+            hover_name='country',
+            hover_data={'country_code': False, 'total_worth': ':.1f', 'median_worth': ':.2f', 'count': True}
+        )
+        return fig_wealth
+
+    with perf.section("wealth_map"):
+        fig_wealth = cached_figure("country_wealth_map", None, build_wealth_map)
+        st.plotly_chart(fig_wealth)
+    st.caption("🌎 This map displays the total billionaire net worth per country in 2023.")
+
+    st.markdown("<div class='custom-header' style='margin-top: 30px;'>Billionaire Wealth vs the Economy</div>", unsafe_allow_html=True)
+    st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
+    metric_label = st.radio("Compare countries by:", list(ECONOMY_METRICS), horizontal=True)
+    metric = ECONOMY_METRICS[metric_label]
+    st.markdown(f"<div class='custom-subtitle'>Top {ECONOMY_TOP_N} Countries by {metric_label}</div>", unsafe_allow_html=True)
+
+    def build_economy_chart():
+        # Country aggregates joined to the country dimension table
+        economy = wealth_vs_economy().dropna(subset=[metric])
+        top = economy.nlargest(ECONOMY_TOP_N, metric).sort_values(metric)
+        fig_economy = px.bar(
+            top,
+            x=metric,
+            y='country',
+            orientation='h',
+            color=metric,
+            color_continuous_scale="YlOrBr",
+            labels={
+                metric: metric_label,
+                'country': 'Country',
+                'count': 'Number of Billionaires',
+                'total_worth': 'Total Net Worth (in Billion USD)',
+                'gdp': 'GDP (USD)',
+                'population': 'Population'
+            },
+            hover_data={'count': True, 'total_worth': ':.1f', 'gdp': ':,.0f', 'population': ':,.0f', metric: ':.2f'}
+        )
+        fig_economy.update_layout(coloraxis_showscale=False, height=600)
+        return fig_economy
+
+    with perf.section("wealth_vs_economy"):
+        fig_economy = cached_figure("wealth_vs_economy", {"metric": metric}, build_economy_chart)
+        st.plotly_chart(fig_economy)
+    st.caption("🏦 Billionaire net worth relative to each country's GDP and population (2023 country indicators). Countries without GDP or population figures are left out.")
+
+    st.markdown("<div class='custom-header' style='margin-top: 30px;'>Where Billionaires Are Located</div>", unsafe_allow_html=True)
+    st.markdown("<hr class='custom-hr'>", unsafe_allow_html=True)
+    col_region, col_resolution = st.columns(2)
+    with col_region:
+        region = st.selectbox("🗺️ Region:", list(REGIONS))
+    with col_resolution:
+        resolution = st.select_slider("Bin size:", options=list(RESOLUTIONS), value="Medium")
+    st.markdown(f"<div class='custom-subtitle'>Billionaires per {bin_size(region, resolution):g}° Grid Cell</div>", unsafe_allow_html=True)
+
+    def build_location_map():
+        # Only the occupied bins of the region reach the browser
+        binned = bins(region, resolution)
+        fig_location = px.scatter_geo(
+            binned,
+            lat='lat',
+            lon='lon',
+            size='count',
+            color='total_worth',
+            color_continuous_scale="YlOrBr",
+            projection="natural earth",
+            scope=REGIONS[region][0],
+            size_max=40,
+            labels={'count': 'Number of Billionaires', 'total_worth': 'Total Net Worth (in Billion USD)'},
+            hover_data={'lat': False, 'lon': False, 'count': True, 'total_worth': ':.1f'}
+        )
+        fig_location.update_geos(showcountries=True, countrycolor="lightgray")
+        return fig_location
+
+    with perf.section("location_map"):
+        fig_location = cached_figure("location_map", {"region": region, "resolution": resolution}, build_location_map)
+        st.plotly_chart(fig_location)
+    st.caption("📍 Each bubble sums the billionaires in one grid cell. The dataset locates billionaires by their country's coordinates, so finer bins separate countries rather than cities.")
+
+# ---------------------- RUN APP ----------------------
+if __name__ == "__main__":
+    show()
+
@@ -0,0 +1,223 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from cache import LRUCache, make_key
+from data import data_version
+
+# ---------------------- RENDER BUDGET ----------------------
+# Every cached figure is fitted to a point budget before it is serialized,
+# so its payload and the browser's render time stay bounded however many
+# rows the dataset grows to. Scatter traces above WEBGL_POINTS are drawn
+# with WebGL (Scattergl). Above MAX_TRACE_POINTS, numeric line traces are
+# downsampled with Largest-Triangle-Three-Buckets, which keeps peaks and
+# the shape of the curve; marker-only traces keep one point per occupied
+# cell of a MARKER_GRID x MARKER_GRID grid, so the cloud keeps its extent.
+# Bar traces keep their MAX_BARS - 1 largest bars in their original order
+# and sum the rest into one "Other" bar. Categorical scatter traces are only
+# switched to WebGL: dropping categories would change what the chart says.
+
+WEBGL_POINTS = int(os.environ.get("BILLIONAIRES_WEBGL_POINTS", "1000"))
+MAX_TRACE_POINTS = int(os.environ.get("BILLIONAIRES_MAX_TRACE_POINTS", "5000"))
+MARKER_GRID = int(os.environ.get("BILLIONAIRES_MARKER_GRID", "120"))
+MAX_BARS = int(os.environ.get("BILLIONAIRES_MAX_BARS", "50"))
+
+# Per-point trace and marker arrays, indexed together when points are dropped
+POINT_ARRAYS = ("x", "y", "text", "hovertext", "customdata", "ids", "width", "base", "offset")
+MARKER_ARRAYS = ("color", "size", "symbol", "opacity")
+# What the "Other" bar shows in per-point arrays; the rest repeat their
+# last value
+OTHER_VALUES = {"text": "", "hovertext": "", "ids": "Other", "customdata": None, "color": "lightgray"}
+# Arrays whose length is the number of points a trace sends
+COUNTED_ARRAYS = ("x", "y", "lat", "lon", "locations", "values")
+
+# Process-wide: figures fitted, switched to WebGL, reduced, and points
+# before and after fitting
+RENDER_STATS = {"figures": 0, "webgl": 0, "reduced": 0, "points_in": 0, "points_out": 0}
+_stats_lock = threading.Lock()
+
+
+def _points(trace):
+    # Longest per-point array of a trace object or trace dict
+    get = trace.get if isinstance(trace, dict) else lambda key: getattr(trace, key, None)
+    return max((len(get(key)) for key in COUNTED_ARRAYS if get(key) is not None), default=0)
+
+
+def count_points(fig):
+    # Points every trace of `fig` sends to the browser
+    return sum(_points(trace) for trace in fig.data)
+
+
+def _numeric(values):
+    # Float array of `values`, or None for labels; dates count as numbers
+    values = np.asarray(values)
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    if values.dtype.kind in "biuf":
+        return values.astype(float)
+    return None
+
+
+def lttb(x, y, n_out):
+    # Indices of `n_out` points of the series (x sorted), first and last
+    # included: per bucket, the point spanning the largest triangle with the
+    # point kept before it and the average of the next bucket
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[hi:nxt_hi].mean(), y[hi:nxt_hi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def thin(x, y, cells):
+    # Indices of the first point in every occupied cell of a cells x cells grid
+    def cell(values):
+        span = values.max() - values.min()
+        scaled = (values - values.min()) / (span if span else 1) * cells
+        return np.minimum(scaled.astype(np.int64), cells - 1)
+
+    _, first = np.unique(cell(x) * cells + cell(y), return_index=True)
+    return np.sort(first)
+
+
+def _length(value):
+    # Length of a per-point array, None for scalars (e.g. one marker color)
+    if value is None or isinstance(value, (str, dict)) or np.ndim(value) == 0:
+        return None
+    return len(value)
+
+
+def _take(values, idx):
+    if isinstance(values, np.ndarray):
+        return values[idx]
+    return [values[i] for i in idx]
+
+
+def _select(trace, idx, n):
+    # Keeps the points `idx` of every per-point array of `trace`
+    for key in POINT_ARRAYS:
+        if _length(trace.get(key)) == n:
+            trace[key] = _take(trace[key], idx)
+    marker = trace.get("marker") or {}
+    for key in MARKER_ARRAYS:
+        if _length(marker.get(key)) == n:
+            marker[key] = _take(marker[key], idx)
+
+
+def _fit_scatter(trace, n):
+    if trace.get("type") == "scatter" and n > WEBGL_POINTS and not trace.get("stackgroup"):
+        trace = go.Scattergl(trace, skip_invalid=True).to_plotly_json()
+    if n > MAX_TRACE_POINTS and trace.get("x") is not None and trace.get("y") is not None:
+        x, y = _numeric(trace["x"]), _numeric(trace["y"])
+        if x is not None and y is not None and np.isfinite(x).all() and np.isfinite(y).all():
+            if "lines" in trace.get("mode", "lines") and (np.diff(x) >= 0).all():
+                _select(trace, lttb(x, y, MAX_TRACE_POINTS), n)
+            elif "lines" not in trace.get("mode", "lines"):
+                _select(trace, thin(x, y, MARKER_GRID), n)
+    return trace
+
+
+def _fit_bar(trace, n):
+    labels, values = ("y", "x") if trace.get("orientation") == "h" else ("x", "y")
+    if n <= MAX_BARS or trace.get(labels) is None or trace.get(values) is None:
+        return trace
+    amounts = _numeric(trace[values])
+    if amounts is None:
+        return trace
+    keep = np.sort(np.argsort(-np.nan_to_num(amounts, nan=-np.inf), kind="stable")[:MAX_BARS - 1])
+    rest = np.setdiff1d(np.arange(n), keep)
+    _select(trace, keep, n)
+    trace[labels] = list(trace[labels]) + [f"Other ({len(rest)})"]
+    trace[values] = list(trace[values]) + [float(np.nansum(amounts[rest]))]
+    extras = [(trace, key) for key in POINT_ARRAYS if key not in (labels, values)]
+    extras += [(trace.get("marker") or {}, key) for key in MARKER_ARRAYS]
+    for owner, key in extras:
+        if len(trace[labels]) - 1 == _length(owner.get(key)):
+            owner[key] = list(owner[key]) + [OTHER_VALUES.get(key, owner[key][-1])]
+    return trace
+
+
+def _needs_fitting(trace, n):
+    if trace.type == "scatter":
+        return n > WEBGL_POINTS
+    if trace.type == "scattergl":
+        return n > MAX_TRACE_POINTS
+    return trace.type == "bar" and n > MAX_BARS
+
+
+def fit_figure(fig):
+    # `fig` within the render budget: the same figure when every trace fits,
+    # otherwise a new one
+    sizes = [_points(trace) for trace in fig.data]
+    fitted, webgl, kept = [], False, []
+    for trace, n in zip(fig.data, sizes):
+        if not _needs_fitting(trace, n):
+            fitted.append(trace)
+            kept.append(n)
+            continue
+        spec = trace.to_plotly_json()
+        spec = _fit_bar(spec, n) if trace.type == "bar" else _fit_scatter(spec, n)
+        webgl = webgl or (trace.type == "scatter" and spec.get("type") == "scattergl")
+        fitted.append(spec)
+        kept.append(_points(spec))
+
+    with _stats_lock:
+        RENDER_STATS["figures"] += 1
+        RENDER_STATS["webgl"] += webgl
+        RENDER_STATS["reduced"] += kept != sizes
+        RENDER_STATS["points_in"] += sum(sizes)
+        RENDER_STATS["points_out"] += sum(kept)
+    if len(fitted) == len(fig.data) and all(new is old for new, old in zip(fitted, fig.data)):
+        return fig
+    return go.Figure(data=fitted, layout=fig.layout)
+
+
+def top_categories(counts, limit=MAX_BARS):
+    # A Series of counts by label cut to its `limit - 1` largest entries plus
+    # one "Other" entry summing the rest, for bar charts outside Plotly
+    if len(counts) <= limit:
+        return counts
+    top = counts.nlargest(limit - 1)
+    rest = counts.drop(top.index)
+    return pd.concat([top, pd.Series({f"Other ({len(rest)})": rest.sum()}, dtype=counts.dtype)])
+
+
+# ---------------------- FIGURE CACHE ----------------------
+# Serialized Plotly figures keyed by (chart id, normalized parameters, data
+# version) and shared by all sessions. A repeat view skips plotly express
+# and the JSON encoding; rebuilding the Figure from the cached spec without
+# validation is cheap.
+
+FIGURE_CACHE_MB = float(os.environ.get("BILLIONAIRES_FIGURE_CACHE_MB", "64"))
+FIGURE_CACHE = LRUCache(int(FIGURE_CACHE_MB * 1024 * 1024))
+
+
+def figure_key(chart_id, params=None):
+    return make_key(chart_id, params, data_version())
+
+
+def cached_figure(chart_id, params, build):
+    # build() is only called on a miss; it must return a plotly Figure
+    key = figure_key(chart_id, params)
+    spec = FIGURE_CACHE.get(key)
+    if spec is not None:
+        return go.Figure(json.loads(spec), _validate=False)
+
+    fig = fit_figure(build())
+    spec = fig.to_json()
+    FIGURE_CACHE.put(key, spec, len(spec))
+    return fig
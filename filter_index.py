@@ -0,0 +1,283 @@
+import numpy as np
+import pandas as pd
+
+from data import append_segment, derived
+
+# ---------------------- FILTER INDEX ----------------------
+# Rows are ordered once by net worth, so a slider range is a contiguous slice
+# of that order found by binary search. Every distinct country and industry
+# gets a packed bitmap over the same order, so a filter change is a few
+# byte-wise OR/AND passes over the slice instead of string comparisons.
+# Ingested rows get an index segment of their own; queries run per segment
+# and merge, until too many segments trigger a rebuild.
+
+INDEXED_COLUMNS = ["country", "industries"]
+VALUE_COLUMN = "finalWorth"
+MISSING = "Unknown"
+
+# Columns a windowed table can be sorted by; missing values always sort last
+SORT_COLUMNS = ["rank", "finalWorth", "personName", "age", "country", "industries"]
+FRAME_COLUMNS = list(dict.fromkeys(SORT_COLUMNS + INDEXED_COLUMNS + [VALUE_COLUMN]))
+
+# Number of set bits in every possible byte
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+class Selection:
+    # Result of FilterIndex.select(): packed bits over sorted positions lo..hi
+
+    def __init__(self, index, bits, lo, hi):
+        self.index = index
+        self.bits = bits
+        self.lo = lo
+        self.hi = hi
+
+    @property
+    def nbytes(self):
+        return 0 if self.bits is None else self.bits.nbytes
+
+    def _unpacked(self):
+        if self.bits is None:
+            return np.zeros(0, dtype=bool)
+        start = self.lo - (self.lo // 8) * 8
+        return np.unpackbits(self.bits)[start:start + self.hi - self.lo].view(bool)
+
+    def count(self):
+        if self.bits is None:
+            return 0
+        total = int(_POPCOUNT[self.bits].sum(dtype=np.int64))
+        # Drop the bits outside lo..hi that share a byte with the range ends
+        head = self.lo % 8
+        tail = (-self.hi) % 8
+        if head:
+            total -= int(np.unpackbits(self.bits[:1])[:head].sum())
+        if tail:
+            total -= int(np.unpackbits(self.bits[-1:])[8 - tail:].sum())
+        return total
+
+    def sorted_positions(self):
+        # Matching positions in ascending net-worth order
+        return np.flatnonzero(self._unpacked()) + self.lo
+
+    def rows(self):
+        # Matching row positions of the indexed frame, in original row order
+        return np.sort(self.index.order[self.sorted_positions()])
+
+    def top_positions(self, stop, sort_column=VALUE_COLUMN, descending=True):
+        # Sorted positions of the first `stop` result rows under the requested
+        # order, without fully sorting the rest of the result. The order is
+        # total: key (missing last), then row position, so every window is a
+        # slice of the same full sort.
+        positions = self.sorted_positions()
+        stop = min(stop, len(positions))
+        if stop <= 0:
+            return positions[:0]
+
+        if sort_column == VALUE_COLUMN and not descending:
+            # Positions are already in ascending net-worth, then row, order
+            return positions[:stop]
+
+        keys = self.index.key_values(sort_column, positions, labels=False)
+        if descending:
+            keys = -keys
+        rows = self.index.order[positions]
+        if stop < len(positions):
+            # Every row strictly before the stop-th key, then the rows tied
+            # with it in row order
+            kth = np.partition(keys, stop - 1)[stop - 1]
+            missing = np.isnan(keys)
+            if np.isnan(kth):
+                before, tied = ~missing, missing
+            else:
+                before, tied = keys < kth, keys == kth
+            tied = np.flatnonzero(tied)
+            tied = tied[np.argsort(rows[tied], kind="stable")[:stop - int(before.sum())]]
+            keep = np.concatenate([np.flatnonzero(before), tied])
+            positions, keys, rows = positions[keep], keys[keep], rows[keep]
+        return positions[np.lexsort((rows, keys))]
+
+    def window(self, start, stop, sort_column=VALUE_COLUMN, descending=True):
+        # Row positions of result rows start..stop under the requested order
+        return self.index.order[self.top_positions(stop, sort_column, descending)[start:]]
+
+    def value_counts(self, col):
+        # Matches per indexed value, straight from the bitmaps
+        if self.bits is None:
+            return pd.Series(dtype="int64")
+        b0 = self.lo // 8
+        head = self.lo - b0 * 8
+        stop = head + self.hi - self.lo
+        counts = {}
+        for value, bitmap in self.index.bitmaps[col].items():
+            both = np.bitwise_and(self.bits, bitmap[b0:b0 + len(self.bits)])
+            if both.any():
+                count = int(np.unpackbits(both)[head:stop].sum())
+                if count:
+                    counts[value] = count
+        return pd.Series(counts, dtype="int64").sort_values(ascending=False)
+
+
+class FilterIndex:
+
+    def __init__(self, df, columns=INDEXED_COLUMNS, value_column=VALUE_COLUMN, offset=0):
+        # `offset` is the row position of df's first row in the full frame
+        values = df[value_column].to_numpy(dtype=float, na_value=np.nan)
+        order = np.argsort(values, kind="stable")
+        self.sorted_values = values[order]
+        self.size = len(df)
+        # Rows with a net worth; NaN sorts last, after sorted_values[valued - 1]
+        self.valued = int(np.count_nonzero(~np.isnan(values)))
+        self.bitmaps = {}
+        self.categories = {}
+        self.sort_keys = {}
+        self.sort_labels = {}
+
+        # Sort keys in net-worth order: numbers as floats, labels as sorted codes
+        for col in SORT_COLUMNS:
+            if col not in df.columns:
+                continue
+            if pd.api.types.is_numeric_dtype(df[col]):
+                keys = df[col].to_numpy(dtype=float, na_value=np.nan)
+            else:
+                codes, uniques = pd.factorize(df[col], sort=True)
+                keys = np.where(codes < 0, np.nan, codes.astype(float))
+                self.sort_labels[col] = np.append(np.asarray(uniques, dtype=object), np.nan)
+            self.sort_keys[col] = keys[order]
+
+        for col in columns:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            codes = codes[order]
+            uniques = list(uniques)
+            bitmaps = {value: np.packbits(codes == code) for code, value in enumerate(uniques)}
+            if (codes == -1).any():
+                # Missing labels are filtered as MISSING, like the pages display them
+                missing = np.packbits(codes == -1)
+                bitmaps[MISSING] = bitmaps[MISSING] | missing if MISSING in bitmaps else missing
+            self.categories[col] = sorted(bitmaps)
+            self.bitmaps[col] = bitmaps
+
+        # Row positions in the full frame, in net-worth order
+        self.order = order + offset
+        self.offset = offset
+        self._positions = None
+
+    def _row_bits(self, rows, b0, b1):
+        # Packed bits over sorted positions of the given full-frame rows
+        if self._positions is None:
+            # Sorted position of every row of this segment
+            self._positions = np.empty(self.size, dtype=np.int64)
+            self._positions[self.order - self.offset] = np.arange(self.size)
+        rows = np.asarray(rows, dtype=np.int64)
+        rows = rows[(rows >= self.offset) & (rows < self.offset + self.size)]
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self._positions[rows - self.offset]] = True
+        return np.packbits(mask)[b0:b1]
+
+    def key_values(self, sort_column, positions, labels=True):
+        # Sort keys at sorted `positions`; with labels=True, label columns give
+        # their labels, which compare across segments, instead of codes
+        keys = self.sort_keys[sort_column][positions] if sort_column != VALUE_COLUMN else self.sorted_values[positions]
+        if labels and sort_column in self.sort_labels:
+            codes = np.where(np.isnan(keys), -1, keys).astype(np.intp)
+            return self.sort_labels[sort_column][codes]
+        return keys
+
+    def _union(self, col, selected, b0, b1):
+        bitmaps = self.bitmaps[col]
+        selected = {value for value in selected if value in bitmaps}
+        # OR the smaller side: the selected values, or the complement inverted
+        invert = len(selected) > len(bitmaps) / 2
+        values = bitmaps.keys() - selected if invert else selected
+
+        acc = np.zeros(b1 - b0, dtype=np.uint8)
+        for value in values:
+            np.bitwise_or(acc, bitmaps[value][b0:b1], out=acc)
+        if invert:
+            np.invert(acc, out=acc)
+        return acc
+
+    def select(self, filters=None, value_range=None, rows=None):
+        # filters: {column: iterable of allowed values}; value_range: (low, high);
+        # rows: full-frame row positions to keep (e.g. search matches)
+        lo, hi = 0, self.size
+        if value_range is not None:
+            lo = int(np.searchsorted(self.sorted_values, value_range[0], side="left"))
+            hi = int(np.searchsorted(self.sorted_values, value_range[1], side="right"))
+        if lo >= hi:
+            return Selection(self, None, 0, 0)
+
+        b0, b1 = lo // 8, (hi + 7) // 8
+        bits = None
+        for col, selected in (filters or {}).items():
+            part = self._union(col, selected, b0, b1)
+            bits = part if bits is None else np.bitwise_and(bits, part, out=bits)
+        if rows is not None:
+            part = self._row_bits(rows, b0, b1)
+            bits = part if bits is None else np.bitwise_and(bits, part, out=bits)
+        if bits is None:
+            bits = np.full(b1 - b0, 0xFF, dtype=np.uint8)
+        return Selection(self, bits, lo, hi)
+
+
+class SegmentedSelection:
+    # Selection over every segment of a SegmentedIndex
+
+    def __init__(self, parts):
+        self.parts = parts
+
+    @property
+    def nbytes(self):
+        return sum(part.nbytes for part in self.parts)
+
+    def count(self):
+        return sum(part.count() for part in self.parts)
+
+    def rows(self):
+        return np.sort(np.concatenate([part.rows() for part in self.parts]))
+
+    def window(self, start, stop, sort_column=VALUE_COLUMN, descending=True):
+        if len(self.parts) == 1:
+            return self.parts[0].window(start, stop, sort_column, descending)
+        # Each segment's first `stop` rows, merged on comparable keys
+        keys, rows = [], []
+        for part in self.parts:
+            positions = part.top_positions(stop, sort_column, descending)
+            keys.append(part.index.key_values(sort_column, positions))
+            rows.append(part.index.order[positions])
+        merged = pd.DataFrame({"key": np.concatenate(keys), "row": np.concatenate(rows)})
+        merged = merged.sort_values(["key", "row"], ascending=[not descending, True], na_position="last")
+        return merged["row"].to_numpy()[start:stop]
+
+    def value_counts(self, col):
+        counts = [part.value_counts(col) for part in self.parts]
+        if len(counts) == 1:
+            return counts[0]
+        total = pd.concat(counts).groupby(level=0).sum()
+        return total.astype("int64").sort_values(ascending=False)
+
+
+class SegmentedIndex:
+    # One FilterIndex per ingested batch of rows
+
+    def __init__(self, segments):
+        self.segments = segments
+        self.categories = {
+            col: sorted(set().union(*(seg.categories[col] for seg in segments)))
+            for col in segments[0].categories
+        }
+
+    def value_bounds(self):
+        # Smallest and largest known net worth; (0, 0) when there is none
+        lows = [seg.sorted_values[0] for seg in self.segments if seg.valued]
+        highs = [seg.sorted_values[seg.valued - 1] for seg in self.segments if seg.valued]
+        if not lows:
+            return 0.0, 0.0
+        return float(min(lows)), float(max(highs))
+
+    def select(self, filters=None, value_range=None, rows=None):
+        return SegmentedSelection([seg.select(filters, value_range, rows) for seg in self.segments])
+
+
+@derived(columns=FRAME_COLUMNS, update=append_segment(FilterIndex, SegmentedIndex))
+def get_filter_index(df):
+    return SegmentedIndex([FilterIndex(df)])
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from data import derived
+
+# ---------------------- GEOGRAPHIC BINS ----------------------
+# Located billionaires are counted once into a sparse grid of BASE_CELL
+# degree cells (count, summed net worth and summed coordinates per occupied
+# cell). A map view then only regroups those cells into coarser bins that
+# suit its region, so the browser receives one point per bin and the cost
+# depends on occupied cells, not on billionaires. Ingested rows are binned
+# on their own and merged into the grid.
+
+LATITUDE = "latitude_country"
+LONGITUDE = "longitude_country"
+MEASURE = "finalWorth"
+BASE_CELL = 0.5
+
+# Region -> plotly geo scope, latitude range, longitude range
+REGIONS = {
+    "World": ("world", (-90, 90), (-180, 180)),
+    "North America": ("north america", (5, 85), (-170, -50)),
+    "South America": ("south america", (-60, 15), (-95, -30)),
+    "Europe": ("europe", (34, 72), (-25, 45)),
+    "Africa": ("africa", (-36, 38), (-20, 55)),
+    "Asia": ("asia", (-12, 62), (25, 150)),
+}
+# Resolution -> number of bins across the region's width
+RESOLUTIONS = {"Coarse": 12, "Medium": 24, "Fine": 48}
+
+
+def build_grid(df):
+    lat = df[LATITUDE].to_numpy(dtype=float, na_value=np.nan)
+    lon = df[LONGITUDE].to_numpy(dtype=float, na_value=np.nan)
+    worth = df[MEASURE].to_numpy(dtype=float, na_value=np.nan)
+    located = ~(np.isnan(lat) | np.isnan(lon))
+    lat, lon, worth = lat[located], lon[located], np.nan_to_num(worth[located])
+
+    rows = np.floor((np.clip(lat, -90, 90) + 90) / BASE_CELL).astype(np.int32)
+    cols = np.floor((np.clip(lon, -180, 180) + 180) / BASE_CELL).astype(np.int32)
+    keys, cell = np.unique(rows.astype(np.int64) * 1_000 + cols, return_inverse=True)
+    return pd.DataFrame({
+        "row": (keys // 1_000).astype(np.int32),
+        "col": (keys % 1_000).astype(np.int32),
+        "count": np.bincount(cell, minlength=len(keys)),
+        "worth": np.bincount(cell, weights=worth, minlength=len(keys)),
+        "lat_sum": np.bincount(cell, weights=lat, minlength=len(keys)),
+        "lon_sum": np.bincount(cell, weights=lon, minlength=len(keys)),
+    })
+
+
+def merge_grids(grid, delta):
+    # Every measure is a sum, so cells merge exactly
+    merged = pd.concat([grid, build_grid(delta)], ignore_index=True)
+    return merged.groupby(["row", "col"], as_index=False, sort=True).sum()
+
+
+@derived(columns=[LATITUDE, LONGITUDE, MEASURE], resident=False, update=merge_grids)
+def get_grid(df):
+    return build_grid(df)
+
+
+def bin_size(region, resolution):
+    # Degrees per bin: the region's width over the wanted number of bins,
+    # rounded to whole grid cells
+    width = REGIONS[region][2][1] - REGIONS[region][2][0]
+    return max(1, round(width / RESOLUTIONS[resolution] / BASE_CELL)) * BASE_CELL
+
+
+def bins(region="World", resolution="Medium"):
+    # One row per occupied bin inside the region: count-weighted centroid,
+    # billionaire count and total net worth (billions of USD)
+    grid = get_grid()
+    _, (lat0, lat1), (lon0, lon1) = REGIONS[region]
+    lat = grid["lat_sum"] / grid["count"]
+    lon = grid["lon_sum"] / grid["count"]
+    part = grid[lat.between(lat0, lat1) & lon.between(lon0, lon1)]
+
+    factor = int(round(bin_size(region, resolution) / BASE_CELL))
+    binned = part.groupby([part["row"] // factor, part["col"] // factor], sort=False)[
+        ["count", "worth", "lat_sum", "lon_sum"]
+    ].sum()
+    return pd.DataFrame({
+        "lat": binned["lat_sum"] / binned["count"],
+        "lon": binned["lon_sum"] / binned["count"],
+        "count": binned["count"],
+        # finalWorth is in millions of USD
+        "total_worth": binned["worth"] / 1000,
+    }).reset_index(drop=True)
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from data import derived
+
+# ---------------------- WEALTH INEQUALITY ----------------------
+# Gini coefficient, percentiles, top-1% share and a sampled Lorenz curve for
+# the whole list and for every group of each dimension below. Per dimension
+# the net worths are sorted once by (group, worth); every statistic then
+# comes from one global cumulative sum and the group boundaries, so no group
+# is sorted or scanned on its own. Built once per data version; choosing a
+# group is a row lookup.
+
+VALUE_COLUMN = "finalWorth"
+# Dimension label -> column; "Overall" is the whole list as one group
+DIMENSIONS = {
+    "Overall": None,
+    "Country": "country",
+    "Industry": "industries",
+    "Gender": "gender",
+    "Age band": "ageGroup",
+}
+OVERALL = "All billionaires"
+PERCENTILES = {"p50": 0.50, "p90": 0.90, "p99": 0.99}
+TOP_SHARE = 0.01
+# Points of each sampled Lorenz curve, at population shares 0, 1/100, ..., 1
+LORENZ_POINTS = 101
+
+
+class GroupStats:
+    # Statistics for every group of one dimension, in the same order as
+    # `table` rows and `lorenz` rows
+
+    def __init__(self, worth, codes, labels):
+        # worth: net worths with NaN removed; codes: group of each (-1 = none)
+        known = codes >= 0
+        worth, codes = worth[known], codes[known]
+        order = np.lexsort((worth, codes))
+        worth, codes = worth[order], codes[order]
+
+        counts = np.bincount(codes, minlength=len(labels))
+        present = counts > 0
+        counts, labels = counts[present], np.asarray(labels, dtype=object)[present]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        group = np.repeat(np.arange(len(counts)), counts)
+
+        # cum[i] = sum of the first i sorted worths, across all groups
+        cum = np.concatenate(([0.0], np.cumsum(worth)))
+        totals = cum[starts + counts] - cum[starts]
+
+        # Gini = 2 * sum(rank * x) / (n * total) - (n + 1) / n, ranks from 1
+        ranks = np.arange(len(worth)) - starts[group] + 1
+        weighted = np.bincount(group, weights=ranks * worth, minlength=len(counts))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gini = 2 * weighted / (counts * totals) - (counts + 1) / counts
+
+        table = {"group": labels, "count": counts, "total_worth": totals, "gini": gini}
+        for name, q in PERCENTILES.items():
+            table[name] = self._percentile(worth, starts, counts, q)
+
+        # Top 1% (at least one person) share of the group's wealth
+        top = np.maximum(np.ceil(TOP_SHARE * counts).astype(np.int64), 1)
+        ends = starts + counts
+        with np.errstate(divide="ignore", invalid="ignore"):
+            table["top1_share"] = (cum[ends] - cum[ends - top]) / totals
+
+        self.table = pd.DataFrame(table)
+        # Cumulative wealth share held by the poorest p of each group
+        shares = np.linspace(0, 1, LORENZ_POINTS)
+        taken = np.rint(shares[None, :] * counts[:, None]).astype(np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.lorenz = (cum[starts[:, None] + taken] - cum[starts][:, None]) / totals[:, None]
+        self.positions = {label: i for i, label in enumerate(labels)}
+
+    @staticmethod
+    def _percentile(worth, starts, counts, q):
+        # Linear interpolation between order statistics, as numpy's default
+        at = q * (counts - 1)
+        lo = np.floor(at).astype(np.int64)
+        hi = np.minimum(lo + 1, counts - 1)
+        low, high = worth[starts + lo], worth[starts + hi]
+        return low + (high - low) * (at - lo)
+
+    def row(self, label):
+        return self.table.iloc[self.positions[label]]
+
+    def curve(self, label):
+        return self.lorenz[self.positions[label]]
+
+
+def build_inequality(df):
+    worth = df[VALUE_COLUMN].to_numpy(dtype=float, na_value=np.nan)
+    valued = ~np.isnan(worth)
+    stats = {}
+    for label, col in DIMENSIONS.items():
+        if col is None:
+            codes, groups = np.zeros(len(df), dtype=np.int64), [OVERALL]
+        else:
+            # Age bands keep their categorical order, other labels sort
+            codes, groups = pd.factorize(df[col], sort=True)
+        stats[label] = GroupStats(worth[valued], np.asarray(codes)[valued], list(groups))
+    return stats
+
+
+@derived(columns=[col for col in DIMENSIONS.values() if col] + [VALUE_COLUMN])
+def get_inequality(df):
+    return build_inequality(df)
@@ -0,0 +1,138 @@
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+import perf
+from figures import cached_figure
+from inequality import DIMENSIONS, LORENZ_POINTS, OVERALL, get_inequality
+
+# Groups smaller than this are listed but left out of the Gini comparison
+MIN_GROUP_SIZE = 10
+COMPARE_TOP_N = 20
+
+
+def billions(value):
+    # finalWorth is in millions of USD
+    return f"${value / 1000:,.1f}B"
+
+
+def show():
+    st.title("⚖️ How Concentrated Is Billionaire Wealth?")
+
+    st.markdown("""
+    Even among billionaires, wealth is far from evenly spread. This page measures how concentrated net worth is,
+    for the whole 2023 list and within each country, industry, gender and age band.
+
+    - The **Gini coefficient** runs from 0 (everyone holds the same) to 1 (one person holds everything).
+    - The **Lorenz curve** shows the share of the group's wealth held by its poorest x% — the further it sags below the diagonal, the more unequal the group.
+    - **Percentiles** give the net worth below which 50%, 90% and 99% of the group fall, and the **top 1% share** is the part of the group's wealth held by its richest 1%.
+    """)
+
+    try:
+        with perf.section("inequality"):
+            stats = get_inequality()
+    except FileNotFoundError:
+        st.error("❌ Dataset file 'Billionaires Statistics Dataset.csv' not found.")
+        return
+
+    col_dim, col_group = st.columns(2)
+    with col_dim:
+        dimension = st.selectbox("📐 Compare by:", list(DIMENSIONS))
+    groups = stats[dimension]
+    # Largest groups first; age bands keep their natural order
+    table = groups.table if dimension == "Age band" else groups.table.sort_values("count", ascending=False, kind="stable")
+    with col_group:
+        group = st.selectbox("🎯 Group:", table["group"].tolist(), disabled=dimension == "Overall")
+
+    # === Headline numbers ===
+    row = groups.row(group)
+    overall = stats["Overall"].row(OVERALL)
+    cols = st.columns(5)
+    cols[0].metric("Gini coefficient", f"{row['gini']:.3f}",
+                   delta=None if group == OVERALL else f"{row['gini'] - overall['gini']:+.3f} vs all",
+                   delta_color="inverse")
+    cols[1].metric("Median (p50)", billions(row["p50"]))
+    cols[2].metric("p90", billions(row["p90"]))
+    cols[3].metric("p99", billions(row["p99"]))
+    cols[4].metric("Top 1% share", f"{row['top1_share']:.1%}")
+    st.caption(f"{int(row['count'])} billionaires with a combined net worth of {billions(row['total_worth'])}.")
+
+    # === Lorenz curve ===
+    st.subheader(f"📈 Lorenz Curve: {group}")
+
+    def build_lorenz_chart():
+        shares = np.linspace(0, 100, LORENZ_POINTS)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=shares, y=shares, mode="lines", name="Perfect equality",
+            line=dict(color="gray", dash="dash")
+        ))
+        if group != OVERALL:
+            fig.add_trace(go.Scatter(
+                x=shares, y=stats["Overall"].curve(OVERALL) * 100, mode="lines",
+                name=OVERALL, line=dict(color="#1f77b4", width=1)
+            ))
+        fig.add_trace(go.Scatter(
+            x=shares, y=groups.curve(group) * 100, mode="lines", name=group,
+            line=dict(color="#FFC200", width=3), fill="tonexty" if group == OVERALL else None
+        ))
+        fig.update_layout(
+            xaxis_title="Share of billionaires, poorest first (%)",
+            yaxis_title="Share of net worth held (%)",
+            template="plotly_white",
+            height=500,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02)
+        )
+        return fig
+
+    with perf.section("lorenz_chart"):
+        fig = cached_figure("lorenz_curve", {"dimension": dimension, "group": group}, build_lorenz_chart)
+        st.plotly_chart(fig, use_container_width=True)
+
+    if dimension == "Overall":
+        return
+
+    # === Comparison across groups ===
+    st.subheader(f"📊 Gini Coefficient by {dimension}")
+    comparable = table[table["count"] >= MIN_GROUP_SIZE]
+    if dimension != "Age band":
+        comparable = comparable.head(COMPARE_TOP_N)
+
+    def build_gini_chart():
+        ordered = comparable.sort_values("gini") if dimension != "Age band" else comparable
+        fig = go.Figure(go.Bar(
+            x=ordered["gini"],
+            y=ordered["group"],
+            orientation="h",
+            marker_color=["#FFC200" if g == group else "#c9c9c9" for g in ordered["group"]],
+            customdata=ordered[["count"]],
+            hovertemplate="%{y}: Gini %{x:.3f} (%{customdata[0]} billionaires)<extra></extra>"
+        ))
+        fig.add_vline(x=overall["gini"], line_dash="dash", line_color="gray", annotation_text="All billionaires")
+        fig.update_layout(xaxis_title="Gini coefficient", template="plotly_white", height=max(300, 28 * len(ordered)))
+        return fig
+
+    with perf.section("gini_chart"):
+        fig_gini = cached_figure("gini_by_group", {"dimension": dimension, "group": group}, build_gini_chart)
+        st.plotly_chart(fig_gini, use_container_width=True)
+    if dimension != "Age band":
+        st.caption(f"The {COMPARE_TOP_N} largest groups with at least {MIN_GROUP_SIZE} billionaires.")
+
+    with st.expander(f"📋 All {dimension.lower()} groups"):
+        shown = table.assign(
+            total_worth=table["total_worth"] / 1000,
+            p50=table["p50"] / 1000,
+            p90=table["p90"] / 1000,
+            p99=table["p99"] / 1000,
+            top1_share=table["top1_share"] * 100,
+        ).rename(columns={
+            "group": dimension,
+            "count": "Billionaires",
+            "total_worth": "Total ($B)",
+            "gini": "Gini",
+            "p50": "p50 ($B)",
+            "p90": "p90 ($B)",
+            "p99": "p99 ($B)",
+            "top1_share": "Top 1% share (%)",
+        })
+        st.dataframe(shown.round(3), use_container_width=True, hide_index=True)
@@ -0,0 +1,310 @@
+import contextlib
+import contextvars
+import json
+import os
+import pickle
+import threading
+import time
+import tracemalloc
+
+import streamlit as st
+
+# ---------------------- RERUN INSTRUMENTATION ----------------------
+# Nested timing sections for one script run. Each section records wall time,
+# bytes allocated (only while allocation tracking is on) and the bytes of
+# messages sent to the browser. Sections are no-ops unless the sidebar panel
+# is enabled for the session or BILLIONAIRES_METRICS_LOG names a log file.
+#
+#   with perf.section("filter"):
+#       ...
+#
+# Payload bytes are counted by wrapping ScriptRunContext._enqueue, a private
+# Streamlit attribute (requirements.txt caps Streamlit at the versions this
+# was checked against). Without it the payload column stays empty.
+
+METRICS_LOG = os.environ.get("BILLIONAIRES_METRICS_LOG")
+PANEL_KEY = "perf_panel"
+ALLOC_KEY = "perf_track_alloc"
+LAST_RUN_KEY = "perf_last_run"
+
+_run = contextvars.ContextVar("perf_run", default=None)
+_log_lock = threading.Lock()
+# Owners of the process-wide allocation tracing: ("session", id) for every
+# session with the panel's checkbox on, and the page profiler while it runs
+_alloc_owners = set()
+_alloc_lock = threading.Lock()
+
+
+class _Run:
+
+    def __init__(self, page):
+        self.page = page
+        self.sections = []
+        self.depth = 0
+        self.payload_bytes = 0
+        # False when this Streamlit version has no message hook to count with
+        self.counts_payload = False
+        self.track_alloc = tracemalloc.is_tracing()
+
+
+def _script_context():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return get_script_run_ctx()
+    except ImportError:
+        return None
+
+
+@contextlib.contextmanager
+def _measured(run, name):
+    entry = {"section": name, "depth": run.depth}
+    run.sections.append(entry)
+    run.depth += 1
+    payload_before = run.payload_bytes
+    alloc_before = tracemalloc.get_traced_memory()[0] if run.track_alloc else 0
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry["seconds"] = time.perf_counter() - start
+        entry["payload_bytes"] = run.payload_bytes - payload_before if run.counts_payload else None
+        if run.track_alloc:
+            entry["alloc_bytes"] = tracemalloc.get_traced_memory()[0] - alloc_before
+        run.depth -= 1
+
+
+_NULL = contextlib.nullcontext()
+
+
+def section(name):
+    run = _run.get()
+    if run is None:
+        return _NULL
+    return _measured(run, name)
+
+
+def enabled():
+    return METRICS_LOG is not None or st.session_state.get(PANEL_KEY, False)
+
+
+def set_alloc_tracking(owner, wanted):
+    # tracemalloc is process-wide: keep it on while any owner asks for it
+    with _alloc_lock:
+        if wanted:
+            _alloc_owners.add(owner)
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        else:
+            _alloc_owners.discard(owner)
+            if not _alloc_owners and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+
+def _release_closed_sessions():
+    # A session closed with the checkbox on never unchecks it: drop the
+    # sessions the runtime no longer knows
+    try:
+        from streamlit import runtime
+        if not runtime.exists():
+            return
+        instance = runtime.get_instance()
+    except ImportError:
+        return
+    closed = [owner for owner in list(_alloc_owners) if owner[0] == "session" and not instance.is_active_session(owner[1])]
+    for owner in closed:
+        set_alloc_tracking(owner, False)
+
+
+@contextlib.contextmanager
+def track_run(page):
+    # Wraps one script run; a no-op unless instrumentation is enabled
+    if _alloc_owners:
+        _release_closed_sessions()
+    if not enabled():
+        yield
+        return
+
+    ctx = _script_context()
+    set_alloc_tracking(("session", getattr(ctx, "session_id", None)), st.session_state.get(ALLOC_KEY, False))
+    run = _Run(page)
+    token = _run.set(run)
+
+    original_enqueue = getattr(ctx, "_enqueue", None)
+    run.counts_payload = callable(original_enqueue)
+    if run.counts_payload:
+        def counting_enqueue(msg):
+            run.payload_bytes += msg.ByteSize()
+            original_enqueue(msg)
+        ctx._enqueue = counting_enqueue
+
+    try:
+        with _measured(run, "rerun"):
+            yield
+    finally:
+        if run.counts_payload:
+            ctx._enqueue = original_enqueue
+        _run.reset(token)
+        st.session_state[LAST_RUN_KEY] = {"page": page, "sections": run.sections}
+        if METRICS_LOG:
+            _append_log(ctx, run)
+
+
+def _append_log(ctx, run):
+    record = {
+        "ts": time.time(),
+        "session": getattr(ctx, "session_id", None),
+        "page": run.page,
+        "sections": run.sections,
+    }
+    line = json.dumps(record) + "\n"
+    with _log_lock:
+        with open(METRICS_LOG, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def show_panel():
+    # Opt-in sidebar panel with the previous run's sections
+    st.toggle("⏱️ Performance panel", key=PANEL_KEY)
+    if not st.session_state.get(PANEL_KEY):
+        return
+    st.checkbox("Track allocations (slows every session)", key=ALLOC_KEY)
+    _show_memory()
+    _show_caches()
+    _show_render()
+    _show_warmup()
+    _show_pages()
+
+    last = st.session_state.get(LAST_RUN_KEY)
+    if not last:
+        st.caption("Interact with the app to record a rerun.")
+        return
+
+    st.caption(f"Last rerun of `{last['page']}`")
+    rows = []
+    for entry in last["sections"]:
+        row = {
+            "section": "  " * entry["depth"] + entry["section"],
+            "ms": round(entry.get("seconds", 0) * 1000, 1),
+            "payload KB": None if entry.get("payload_bytes") is None else round(entry["payload_bytes"] / 1024, 1),
+        }
+        if "alloc_bytes" in entry:
+            row["alloc KB"] = round(entry["alloc_bytes"] / 1024, 1)
+        rows.append(row)
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+
+
+def session_state_bytes():
+    # What this session keeps between reruns, by pickled size; the dataset
+    # itself is shared and never stored per session
+    total = 0
+    for key in list(st.session_state):
+        try:
+            total += len(pickle.dumps(st.session_state[key], protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            continue
+    return total
+
+
+def _show_memory():
+    # Shared dataset footprint (projected columns, compact dtypes) and the
+    # memory held by this session on top of it. Imported here: the data stack
+    # (pandas, pyarrow) is only loaded by pages that need it
+    import data
+
+    try:
+        report = data.column_report()
+    except FileNotFoundError:
+        return
+    st.caption(
+        f"Dataset (shared): {report['columns_loaded']} of {report['columns_total']} columns resident, "
+        f"{report['loaded_bytes'] / 2**20:.1f} MB "
+        f"({report['projection_saved_bytes'] / 2**20:.1f} MB saved by loading only these columns, "
+        f"{report['dtype_saved_bytes'] / 2**20:.1f} MB by compact dtypes)"
+    )
+    mapped = data.snapshot_report()
+    if mapped:
+        st.caption(
+            f"Snapshot: {mapped['mapped_bytes'] / 2**20:.1f} MB mapped (shared between processes), "
+            f"{mapped['structures']} structures, built {mapped['built']}"
+        )
+    st.caption(f"This session: {session_state_bytes() / 1024:.1f} KB of state")
+
+
+def _show_caches():
+    # Shared caches: entries, bytes against budget and hit rate since start
+    from figures import FIGURE_CACHE
+    from results import RESULT_CACHE
+
+    for label, cache in (("Figure cache", FIGURE_CACHE), ("Result cache", RESULT_CACHE)):
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "–"
+        st.caption(
+            f"{label}: {stats['entries']} entries, {stats['bytes'] / 2**20:.1f} of "
+            f"{stats['max_bytes'] / 2**20:.0f} MB, {hit_rate} hits "
+            f"({stats['hits']} of {lookups}), {stats['evictions']} evicted"
+        )
+
+
+def _show_render():
+    # Points sent by the figures built so far, before and after the render budget
+    from figures import RENDER_STATS
+
+    stats = dict(RENDER_STATS)
+    st.caption(
+        f"Charts: {stats['figures']} figures built, {stats['webgl']} switched to WebGL, "
+        f"{stats['reduced']} downsampled, {stats['points_out']:,} of {stats['points_in']:,} points sent"
+    )
+
+
+def _show_warmup():
+    # Progress of the background warm-up and what each page took
+    import warmup
+
+    status = warmup.status()
+    if status["state"] == "idle":
+        st.caption("Warm-up: off")
+        return
+    if status["state"] == "running":
+        st.caption(f"Warm-up: running ({len(status['steps'])} steps done)")
+    else:
+        st.caption(f"Warm-up: {status['state']} in {status['seconds']:.1f} s")
+    with st.expander("Warm-up steps"):
+        st.dataframe(
+            [
+                {"step": step["step"], "ms": round(step["seconds"] * 1000, 1), "error": step["error"] or ""}
+                for step in status["steps"]
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+
+def _show_pages():
+    # Per page: import time and first render in this process, render count,
+    # and the first render in this browser session
+    import registry
+
+    timings = registry.timings()
+    if not timings:
+        return
+    session_timings = st.session_state.get(registry.SESSION_TIMINGS_KEY, {})
+
+    def ms(seconds):
+        return None if seconds is None else round(seconds * 1000, 1)
+
+    with st.expander("Page timings"):
+        st.dataframe(
+            [
+                {
+                    "page": key,
+                    "import ms": ms(timing["import_s"]),
+                    "first render ms": ms(timing["first_render_s"]),
+                    "session first render ms": ms(session_timings.get(key)),
+                    "renders": timing["renders"],
+                }
+                for key, timing in timings.items()
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
@@ -0,0 +1,128 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import pandas as pd
+
+import perf
+import registry
+import warmup
+
+# ---------------------- PAGE PROFILER ----------------------
+# Renders one page's default view on a separate thread outside any browser
+# session (bare mode, as the warm-up does) under cProfile, a tracemalloc
+# snapshot diff and a line tracer limited to the page's own file. Caches
+# stay as they are, so the profile shows what a rerun costs right now.
+# tracemalloc is process-wide: allocations by other sessions during the
+# run are counted too.
+
+THREAD_NAME = "page-profiler"
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 15
+# Allocation tracing owner while a profile runs
+PROFILER_OWNER = ("profiler", THREAD_NAME)
+FUNCTION_COLUMNS = ["function", "calls", "own ms", "total ms"]
+ALLOCATION_COLUMNS = ["site", "KB", "blocks"]
+
+# One profile at a time: the allocation tracing is global
+_lock = threading.Lock()
+
+
+def _function_table(profiler):
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in pstats.Stats(profiler).stats.items():
+        where = name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})"
+        rows.append({"function": where, "calls": calls, "own ms": tottime * 1000, "total ms": cumtime * 1000})
+    return pd.DataFrame(rows, columns=FUNCTION_COLUMNS)
+
+
+def _allocation_table(before, after):
+    rows = []
+    for stat in after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        rows.append({
+            "site": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+            "KB": stat.size_diff / 1024,
+            "blocks": stat.count_diff,
+        })
+    return pd.DataFrame(rows, columns=ALLOCATION_COLUMNS)
+
+
+def _run(key, result):
+    try:
+        module = registry.load_page(key)
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        return
+    filename = module.__file__
+    hits = Counter()
+
+    def trace_lines(frame, event, arg):
+        # Only frames of the page file are traced line by line
+        if frame.f_code.co_filename != filename:
+            return None
+        if event == "line":
+            hits[frame.f_lineno] += 1
+        return trace_lines
+
+    # Tracing stays on afterwards while the perf panel also asks for it
+    perf.set_alloc_tracking(PROFILER_OWNER, True)
+    before = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    sys.settrace(trace_lines)
+    profiler.enable()
+    try:
+        module.show()
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        profiler.disable()
+        sys.settrace(None)
+        result["seconds"] = time.perf_counter() - start
+        after = tracemalloc.take_snapshot()
+        perf.set_alloc_tracking(PROFILER_OWNER, False)
+
+    functions = _function_table(profiler)
+    result["hot"] = functions.nlargest(TOP_FUNCTIONS, "own ms").reset_index(drop=True)
+    result["cumulative"] = functions.nlargest(TOP_FUNCTIONS, "total ms").reset_index(drop=True)
+    result["allocations"] = _allocation_table(
+        before.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]),
+        after.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]),
+    )
+    result["line_hits"] = dict(hits)
+
+
+def profile_page(key):
+    # Returns {"page", "seconds", "hot", "cumulative", "allocations",
+    # "line_hits", "error"}, or None while another profile is running
+    if not _lock.acquire(blocking=False):
+        return None
+    try:
+        functions = pd.DataFrame(columns=FUNCTION_COLUMNS)
+        result = {
+            "page": key, "error": None, "seconds": 0.0, "hot": functions, "cumulative": functions,
+            "allocations": pd.DataFrame(columns=ALLOCATION_COLUMNS), "line_hits": {},
+        }
+        warmup.silence_bare_mode(THREAD_NAME)
+        thread = threading.Thread(target=_run, args=(key, result), name=THREAD_NAME, daemon=True)
+        thread.start()
+        thread.join()
+        return result
+    finally:
+        _lock.release()
+
+
+def annotate(source, line_hits):
+    # Source with a gutter of per-line hit counts (blank for lines not run)
+    width = len(str(max(line_hits.values(), default=0)))
+    lines = source.splitlines()
+    return "\n".join(
+        f"{line_hits[i]:>{width}} │ {line}" if i in line_hits else f"{'':>{width}} │ {line}"
+        for i, line in enumerate(lines, start=1)
+    )
@@ -0,0 +1,81 @@
+import importlib
+import sys
+import threading
+import time
+
+import streamlit as st
+
+import perf
+
+# ---------------------- PAGE REGISTRY ----------------------
+# Page modules (and their plotly / streamlit_extras / annotated_text imports)
+# are only imported the first time someone navigates to them.
+
+HOME_PAGE = "homepage"
+
+# key -> (sidebar title, module name)
+PAGES = {
+    "homepage": ("🏠 Homepage", "homepage"),
+    "facts": ("👋 Billionaires and key facts", "facts"),
+    "dataset": ("📚 Learn about our dataset", "dataset"),
+    "code": ("🧑‍💻 Explore our analysis code", "code_page"),
+    "starts": ("📈Global billionaire statistics", "starts"),
+    "inequality": ("⚖️ Wealth inequality", "inequality_page"),
+}
+
+# Process-wide timing record: key -> {"import_s", "first_render_s", "renders"}
+TIMINGS = {}
+_lock = threading.Lock()
+
+# Session-state key: key -> first render of that page in this browser session
+SESSION_TIMINGS_KEY = "page_first_render_s"
+
+
+def _timing(key):
+    with _lock:
+        return TIMINGS.setdefault(key, {"import_s": None, "first_render_s": None, "renders": 0})
+
+
+def timings():
+    # A copy of TIMINGS, safe to read while pages render
+    with _lock:
+        return {key: dict(timing) for key, timing in TIMINGS.items()}
+
+
+def title(key):
+    return PAGES[key][0]
+
+
+def load_page(key):
+    module_name = PAGES[key][1]
+    if module_name in sys.modules:
+        # Through the import system, which waits while another thread (the
+        # warm-up) is still executing the module
+        return importlib.import_module(module_name)
+
+    start = time.perf_counter()
+    with perf.section(f"import {module_name}"):
+        module = importlib.import_module(module_name)
+    timing = _timing(key)
+    if timing["import_s"] is None:
+        timing["import_s"] = time.perf_counter() - start
+    return module
+
+
+def render(key):
+    module = load_page(key)
+
+    start = time.perf_counter()
+    with perf.section(f"{key}.show"):
+        module.show()
+    elapsed = time.perf_counter() - start
+
+    timing = _timing(key)
+    with _lock:
+        timing["renders"] += 1
+        if timing["first_render_s"] is None:
+            timing["first_render_s"] = elapsed
+
+    # First render of this page in the current browser session
+    session_timings = st.session_state.setdefault(SESSION_TIMINGS_KEY, {})
+    session_timings.setdefault(key, elapsed)
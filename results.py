@@ -0,0 +1,64 @@
+import math
+import os
+import sys
+
+import pandas as pd
+
+from cache import LRUCache, make_key
+from data import data_version
+
+# ---------------------- FILTER RESULT CACHE ----------------------
+# Filter selections, table windows and aggregates keyed by (kind, canonical
+# filter state, data version) and shared by all sessions, so a popular view
+# (the default filters, a common age group or country) is computed once per
+# data version instead of once per session and rerun. Cached values are
+# shared: callers must not modify them.
+
+RESULT_CACHE_MB = float(os.environ.get("BILLIONAIRES_RESULT_CACHE_MB", "64"))
+RESULT_CACHE = LRUCache(int(RESULT_CACHE_MB * 1024 * 1024))
+
+_MISSING = object()
+
+
+def quantize_range(value_range, step, bounds):
+    # Slider values are its minimum plus whole steps, or its maximum. They are
+    # rounded back onto that grid, so float noise in otherwise identical
+    # states maps to one key, and kept within `bounds` (the slider's range) so
+    # the selection never widens past what was chosen
+    lowest, highest = bounds
+
+    def snap(value):
+        for bound in bounds:
+            if math.isclose(value, bound, rel_tol=1e-9, abs_tol=step * 1e-6):
+                return bound
+        # Rounded so the multiplication's float error cannot move a bound
+        # past a value sitting exactly on the grid
+        snapped = round(lowest + round((value - lowest) / step) * step, 9)
+        return min(max(snapped, lowest), highest)
+
+    low, high = value_range
+    return snap(low), snap(high)
+
+
+def result_bytes(value):
+    # Approximate retained size of a cached value
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(result_bytes(v) for v in value)
+    if hasattr(value, "nbytes"):
+        # numpy arrays and filter selections
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+def cached_result(kind, params, build, size=result_bytes):
+    # build() is only called on a miss
+    key = make_key(kind, params, data_version())
+    value = RESULT_CACHE.get(key, _MISSING)
+    if value is _MISSING:
+        value = build()
+        RESULT_CACHE.put(key, value, size(value))
+    return value
@@ -0,0 +1,240 @@
+import numpy as np
+import pandas as pd
+
+from data import append_segment, derived
+
+# ---------------------- TYPEAHEAD SEARCH ----------------------
+# Distinct names, organizations and sources are normalized once (lower case,
+# accents removed) and indexed by character trigram, so a query reads a few
+# posting lists instead of running str.contains over every row. Matches rank
+# exact > prefix > word prefix > substring > fuzzy, where fuzzy means sharing
+# enough trigrams with the query to survive a typo. Ingested rows get an
+# index segment of their own.
+
+# Searched column -> weight of its matches in the ranking
+SEARCH_FIELDS = {"personName": 1.0, "organization": 0.9, "source": 0.8}
+MAX_MATCHES = 50
+# Fuzzy matches: queries of at least this many characters, sharing at
+# least this share of their trigrams with the term
+FUZZY_MIN_LENGTH = 5
+FUZZY_OVERLAP = 0.6
+
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = 1.0, 0.9, 0.8, 0.6, 0.5
+
+
+def normalize(values):
+    # "Bernard Arnault & Família " -> "bernard arnault & familia"
+    return (
+        values.astype("string")
+        .str.normalize("NFKD")
+        .str.replace("[\u0300-\u036f]", "", regex=True)
+        .str.lower()
+        .str.strip()
+        .fillna("")
+    )
+
+
+def _trigram_keys(codes):
+    # 21 bits per code point covers all of Unicode
+    return (codes[:-2].astype(np.uint64) << 42) | (codes[1:-1].astype(np.uint64) << 21) | codes[2:].astype(np.uint64)
+
+
+def _code_points(text):
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def query_trigrams(query, word_start=False):
+    # No trailing space, as the last word may still be typed. word_start adds
+    # a leading space, so the trigrams also say the query starts a word
+    codes = _code_points((" " if word_start else "") + query)
+    if len(codes) < 3:
+        return np.zeros(0, dtype=np.uint64)
+    return np.unique(_trigram_keys(codes))
+
+
+class SearchIndex:
+
+    def __init__(self, df, fields=SEARCH_FIELDS, offset=0):
+        # `offset` is the row position of df's first row in the full frame
+        terms, term_field, term_value, term_code = [], [], [], []
+        self.fields = list(fields)
+        self.rows = []
+        self.stop = offset + len(df)
+        for i, field in enumerate(self.fields):
+            codes, uniques = pd.factorize(df[field])
+            # Rows of each distinct value, contiguous: order[starts[v]:starts[v + 1]]
+            order = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            starts = np.concatenate(([0], np.cumsum(counts))) + (codes < 0).sum()
+            self.rows.append((order + offset, starts))
+            terms.append(normalize(pd.Series(uniques, dtype=object)))
+            term_field.append(np.full(len(uniques), i, dtype=np.int8))
+            term_value.append(np.asarray(uniques, dtype=object))
+            term_code.append(np.arange(len(uniques)))
+
+        self.terms = pd.concat(terms, ignore_index=True)
+        self.term_field = np.concatenate(term_field)
+        self.term_weight = np.array([fields[field] for field in self.fields])[self.term_field]
+        self.term_value = np.concatenate(term_value)
+        self.term_code = np.concatenate(term_code)
+        self._build_trigrams()
+
+    def _build_trigrams(self):
+        # Every term padded as " term " and joined with NUL separators, so the
+        # trigrams of all terms come out of one vectorized pass
+        lengths = self.terms.str.len().to_numpy(dtype=np.int64) + 2
+        codes = _code_points((" " + self.terms + " \0").str.cat())
+        if len(codes) < 3:
+            self.keys = np.zeros(0, dtype=np.uint64)
+            self.starts = np.zeros(1, dtype=np.int64)
+            self.postings = np.zeros(0, dtype=np.int32)
+            return
+        owner = np.repeat(np.arange(len(self.terms), dtype=np.int32), lengths + 1)
+        valid = (codes[:-2] != 0) & (codes[1:-1] != 0) & (codes[2:] != 0)
+        keys = _trigram_keys(codes)[valid]
+        owner = owner[:-2][valid]
+
+        # Distinct (trigram, term) pairs, grouped by trigram
+        order = np.lexsort((owner, keys))
+        keys, owner = keys[order], owner[order]
+        distinct = np.ones(len(keys), dtype=bool)
+        distinct[1:] = (keys[1:] != keys[:-1]) | (owner[1:] != owner[:-1])
+        keys, owner = keys[distinct], owner[distinct]
+
+        self.keys, first = np.unique(keys, return_index=True)
+        self.starts = np.append(first, len(keys))
+        self.postings = owner
+
+    def _hits(self, trigrams):
+        # Number of the query's trigrams each term contains
+        at = np.searchsorted(self.keys, trigrams)
+        found = at < len(self.keys)
+        found[found] = self.keys[at[found]] == trigrams[found]
+        parts = [self.postings[self.starts[i]:self.starts[i + 1]] for i in at[found]]
+        if not parts:
+            return np.zeros(len(self.terms), dtype=np.int64)
+        return np.bincount(np.concatenate(parts), minlength=len(self.terms))
+
+    def _pair_terms(self, pair):
+        # Terms with a trigram starting with the two characters `pair`, i.e.
+        # the contiguous run of trigrams "<pair>?". Terms are padded with
+        # spaces, so " x" finds words starting with x and "xy" every term
+        # containing xy
+        first, second = _code_points(pair).astype(np.uint64)
+        base = (first << np.uint64(42)) | (second << np.uint64(21))
+        lo, hi = np.searchsorted(self.keys, [base, base + np.uint64(1 << 21)])
+        return np.unique(self.postings[self.starts[lo]:self.starts[hi]])
+
+    def matches(self, query, fuzzy=False):
+        # Term ids and scores of the terms containing the normalized query or,
+        # with fuzzy=True, of those sharing enough of its trigrams instead.
+        # One letter only matches the start of a word. Fuzzy matching counts
+        # the word start too, which keeps a typo's remaining trigrams enough
+        trigrams = query_trigrams(query, word_start=fuzzy)
+        if len(trigrams) == 0:
+            if fuzzy:
+                return np.zeros(0, dtype=np.int64), np.zeros(0)
+            terms, share = self._pair_terms(query if len(query) == 2 else " " + query), None
+        else:
+            hits = self._hits(trigrams)
+            # A term containing the query contains all of its trigrams
+            needed = np.ceil(FUZZY_OVERLAP * len(trigrams)) if fuzzy else len(trigrams)
+            terms = np.flatnonzero(hits >= max(needed, 1))
+            share = hits[terms] / len(trigrams)
+
+        text = self.terms.iloc[terms]
+        contains = text.str.contains(query, regex=False).to_numpy(dtype=bool)
+        if fuzzy:
+            keep = ~contains
+            return terms[keep], FUZZY * share[keep] * self.term_weight[terms[keep]]
+        score = np.select(
+            [
+                (text == query).to_numpy(dtype=bool),
+                text.str.startswith(query).to_numpy(dtype=bool),
+                text.str.contains(" " + query, regex=False).to_numpy(dtype=bool),
+                contains,
+            ],
+            [EXACT, PREFIX, WORD_PREFIX, SUBSTRING],
+            default=0.0,
+        )
+        keep = score > 0
+        return terms[keep], score[keep] * self.term_weight[terms[keep]]
+
+    def matched(self, terms):
+        # Row count of every matched term, and the rows of all of them
+        counts = np.zeros(len(terms), dtype=np.int64)
+        rows = []
+        for i, (order, starts) in enumerate(self.rows):
+            in_field = self.term_field[terms] == i
+            codes = self.term_code[terms[in_field]]
+            lo, hi = starts[codes], starts[codes + 1]
+            counts[in_field] = hi - lo
+            rows.append(order[_ranges(lo, hi)])
+        return counts, np.concatenate(rows)
+
+    def values(self, terms, scores, counts):
+        fields = np.array(self.fields, dtype=object)
+        return pd.DataFrame({
+            "field": fields[self.term_field[terms]],
+            "value": self.term_value[terms],
+            "score": scores,
+            "count": counts,
+        })
+
+
+def _ranges(lo, hi):
+    # Concatenation of arange(lo[i], hi[i]) for every i, without a Python loop
+    lengths = hi - lo
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(lengths)
+    return np.arange(total) + np.repeat(lo - (ends - lengths), lengths)
+
+
+class SegmentedSearch:
+    # One SearchIndex per ingested batch of rows
+
+    def __init__(self, segments):
+        self.segments = segments
+
+    def search(self, query, limit=MAX_MATCHES):
+        # Returns (matches, rows): the best `limit` matching values with field,
+        # score and number of rows, and the row positions of every match
+        query = normalize(pd.Series([query])).iloc[0]
+        found = []
+        if query:
+            found = [(seg, seg.matches(query)) for seg in self.segments]
+            # Typo-tolerant matches only when nothing contains the query as typed
+            if not any(len(terms) for _, (terms, _) in found) and len(query) >= FUZZY_MIN_LENGTH:
+                found = [(seg, seg.matches(query, fuzzy=True)) for seg in self.segments]
+
+        found = [(seg, terms, scores) for seg, (terms, scores) in found if len(terms)]
+        if not found:
+            return pd.DataFrame(columns=["field", "value", "score", "count"]), np.zeros(0, dtype=np.int64)
+
+        # Rows of different matches can overlap (a name and a source on the
+        # same row), so they are merged through a mask rather than a sort
+        seen = np.zeros(max(seg.stop for seg in self.segments), dtype=bool)
+        parts = []
+        for seg, terms, scores in found:
+            counts, rows = seg.matched(terms)
+            seen[rows] = True
+            if len(found) == 1:
+                # Only the best `limit` values are turned into a frame
+                best = np.lexsort((-counts, -scores))[:limit]
+                terms, scores, counts = terms[best], scores[best], counts[best]
+            parts.append(seg.values(terms, scores, counts))
+
+        matches = pd.concat(parts, ignore_index=True)
+        if len(parts) > 1:
+            matches = matches.groupby(["field", "value"], as_index=False, sort=False).agg(
+                score=("score", "max"), count=("count", "sum")
+            )
+        matches = matches.nlargest(limit, ["score", "count"]).reset_index(drop=True)
+        return matches, np.flatnonzero(seen)
+
+
+@derived(columns=list(SEARCH_FIELDS), resident=False, update=append_segment(SearchIndex, SegmentedSearch))
+def get_search_index(df):
+    return SegmentedSearch([SearchIndex(df)])
@@ -0,0 +1,120 @@
+import json
+import mmap
+import os
+import pickle
+import sys
+import time
+
+# ---------------------- SHARED SNAPSHOT ----------------------
+# One data file plus a small JSON manifest, written by a single build step
+# and memory-mapped read-only by every server process on the machine.
+# Objects (the canonical frame, derived structures) are pickled with
+# protocol 5: numpy arrays, pandas blocks and Arrow buffers go out of band
+# into the data file and come back as read-only views of the mapping, so
+# their pages live in the OS page cache once however many processes map
+# them. Only the pickled skeletons (labels, dicts, Python lists) are copied
+# into each process. Snapshots are unpickled, so they are trusted like code.
+#
+# `python snapshot.py` builds the snapshot for BILLIONAIRES_CSV; start the
+# server processes afterwards.
+
+# Every buffer starts on this boundary, enough for any numpy dtype
+ALIGN = 64
+
+
+def _paths(directory, name, token=None):
+    manifest_path = os.path.join(directory, f"{name}.json")
+    if token is None:
+        return manifest_path
+    return manifest_path, os.path.join(directory, f"{name}-{token}.bin")
+
+
+def write(directory, name, objects, meta):
+    # Writes `objects` (name -> object) and `meta` as snapshot `name` and
+    # removes the data files of older snapshots; returns the data file path.
+    # Processes still mapping an old file keep it until they exit.
+    os.makedirs(directory, exist_ok=True)
+    token = f"{time.time_ns()}-{os.getpid()}"
+    manifest_path, data_path = _paths(directory, name, token)
+    index = {}
+    with open(data_path, "wb") as f:
+        for key, value in objects.items():
+            buffers = []
+            skeleton = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+            spans = []
+            for buffer in buffers:
+                f.write(b"\0" * (-f.tell() % ALIGN))
+                raw = buffer.raw()
+                spans.append([f.tell(), raw.nbytes])
+                f.write(raw)
+            index[key] = {"pickle": [f.tell(), len(skeleton)], "buffers": spans}
+            f.write(skeleton)
+
+    # Readers follow the manifest, so the data file is complete before it
+    # is published
+    tmp_manifest = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_manifest, "w", encoding="utf-8") as f:
+        json.dump({"data": os.path.basename(data_path), "objects": index, "meta": meta}, f)
+    os.replace(tmp_manifest, manifest_path)
+
+    for file_name in os.listdir(directory):
+        if file_name.startswith(f"{name}-") and file_name.endswith(".bin") and file_name != os.path.basename(data_path):
+            try:
+                os.remove(os.path.join(directory, file_name))
+            except OSError:
+                # Still mapped on a platform that refuses to delete it
+                pass
+    return data_path
+
+
+class Snapshot:
+
+    def __init__(self, data_path, index, meta):
+        self.path = data_path
+        self.meta = meta
+        self.index = index
+        with open(data_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+    @property
+    def nbytes(self):
+        return len(self._map)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def load(self, key):
+        # The object stored under `key`; its arrays are read-only views of
+        # the mapped file, shared with every other process mapping it
+        entry = self.index[key]
+        offset, length = entry["pickle"]
+        buffers = [self._view[start:start + size] for start, size in entry["buffers"]]
+        return pickle.loads(self._view[offset:offset + length], buffers=buffers)
+
+
+def open_snapshot(directory, name):
+    # The published snapshot `name`, or None when there is none (or it is
+    # unreadable, e.g. removed between reading its manifest and mapping it)
+    try:
+        with open(_paths(directory, name), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return Snapshot(os.path.join(directory, manifest["data"]), manifest["objects"], manifest["meta"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+if __name__ == "__main__":
+    import data
+    import registry
+
+    # Importing every page registers every derived structure
+    for key in registry.PAGES:
+        registry.load_page(key)
+    start = time.perf_counter()
+    path = data.write_snapshot()
+    print(
+        f"Snapshot of {data.CSV_PATH} written to {path}: {os.path.getsize(path) / 2**20:.1f} MB "
+        f"in {time.perf_counter() - start:.1f} s",
+        file=sys.stderr,
+    )
@@ -0,0 +1,76 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from data import CACHE_DIR, CSV_PATH
+
+# ---------------------- SYNTHETIC DATASETS ----------------------
+# Scaled-up copies of the real CSV with the same 35-column schema. Rows are
+# resampled from the real billionaires (so country-level fields stay
+# consistent with the country), net worth and age are jittered, names are made
+# unique and rank is recomputed. The file is written in rank order and in
+# chunks, so generating 10M rows does not need 10M rows of strings in memory.
+
+SYNTHETIC_DIR = os.path.join(CACHE_DIR, "synthetic")
+
+
+def synthetic_path(n_rows):
+    return os.path.join(SYNTHETIC_DIR, f"billionaires-{n_rows}.csv")
+
+
+def generate(n_rows, path=None, source=CSV_PATH, seed=0, chunk_rows=250_000):
+    path = path or synthetic_path(n_rows)
+    real = pd.read_csv(source, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+    rng = np.random.default_rng(seed)
+
+    base_worth = pd.to_numeric(real["finalWorth"]).to_numpy(dtype=float)
+    base_age = pd.to_numeric(real["age"].replace("", np.nan)).to_numpy(dtype=float)
+
+    picks = rng.integers(0, len(real), n_rows)
+    worth = base_worth[picks] * rng.lognormal(0.0, 0.25, n_rows)
+    worth = np.maximum(np.round(worth / 100) * 100, 1000).astype(np.int64)
+
+    # Write in rank order like the real file
+    order = np.argsort(-worth, kind="stable")
+    picks, worth = picks[order], worth[order]
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        for start in range(0, n_rows, chunk_rows):
+            stop = min(start + chunk_rows, n_rows)
+            chunk = real.iloc[picks[start:stop]].reset_index(drop=True)
+            ids = np.arange(start, stop)
+
+            chunk["rank"] = (ids + 1).astype(str)
+            chunk["finalWorth"] = worth[start:stop].astype(str)
+            chunk["personName"] = chunk["personName"] + " #" + ids.astype(str)
+
+            age = base_age[picks[start:stop]] + rng.integers(-3, 4, stop - start)
+            age = np.clip(age, 18, 101)
+            known = ~np.isnan(age)
+            chunk.loc[known, "age"] = age[known].astype(int).astype(str)
+            chunk.loc[known, "birthYear"] = (2023 - age[known].astype(int)).astype(str)
+
+            chunk.to_csv(f, header=start == 0, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def ensure(n_rows, seed=0):
+    # Generate the dataset once; later benchmark runs reuse the file
+    path = synthetic_path(n_rows)
+    if not os.path.exists(path):
+        generate(n_rows, path, seed=seed)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic billionaires CSV.")
+    parser.add_argument("rows", type=int, help="number of rows to generate")
+    parser.add_argument("--output", help="CSV path (default: .cache/synthetic/billionaires-<rows>.csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(generate(args.rows, args.output, seed=args.seed))
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import data  # noqa: E402
+
+CSV = os.path.join(ROOT, "Billionaires Statistics Dataset.csv")
+
+
+@pytest.fixture(scope="session")
+def frame():
+    # The canonical frame of the bundled dataset, as the store holds it
+    return data.compact_dtypes(data.parse_csv(CSV))
+
+
+class Dataset:
+    # A CSV holding the first rows of the bundled dataset; append() adds the
+    # following rows, as new records arriving
+
+    def __init__(self, path, lines, start):
+        self.path = path
+        self.lines = lines
+        self.next = start
+
+    def append(self, n):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(self.lines[self.next:self.next + n])
+        self.next += n
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    # A private copy of the first 300 rows with its own cache and delta
+    # directories, and a fresh store and derived cache
+    with open(CSV, "r", encoding="utf-8-sig") as f:
+        lines = f.readlines()
+    csv_path = str(tmp_path / "billionaires.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.writelines(lines[:301])
+    monkeypatch.setattr(data, "CSV_PATH", csv_path)
+    monkeypatch.setattr(data, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(data, "SNAPSHOT_DIR", str(tmp_path / "cache" / "snapshot"))
+    monkeypatch.setattr(data, "DELTA_DIR", str(tmp_path / "deltas"))
+    monkeypatch.setattr(data, "_store", None)
+    monkeypatch.setattr(data, "_derived", {})
+    return Dataset(csv_path, lines, 301)
+
+
+@pytest.fixture(params=["single", "segmented"])
+def layout(request):
+    # build(combine, part, df) puts `df` in one segment, or splits it into an
+    # original third and appended rows, then combines the segments
+    def build(combine, part, df):
+        if request.param == "single":
+            return combine([part(df)])
+        split = len(df) // 3
+        return combine([part(df.iloc[:split]), part(df.iloc[split:], offset=split)])
+    return build
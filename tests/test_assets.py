@@ -0,0 +1,108 @@
+import base64
+import io
+import os
+
+import pytest
+from PIL import Image
+
+import assets
+
+
+@pytest.fixture
+def encoded(tmp_path, monkeypatch):
+    # Thumbnails go to a private directory; every encoding is recorded
+    calls = []
+    encode = assets._encode_thumbnail
+
+    def counting(path, width, height):
+        calls.append((path, width, height))
+        return encode(path, width, height)
+
+    monkeypatch.setattr(assets, "THUMB_DIR", str(tmp_path / "thumbnails"))
+    monkeypatch.setattr(assets, "_encode_thumbnail", counting)
+    assets._data_uri.clear()
+    yield calls
+    assets._data_uri.clear()
+
+
+def save_image(path, color, size=(300, 200)):
+    Image.new("RGB", size, color).save(path)
+    return str(path)
+
+
+def decode(uri):
+    header, payload = uri.split(",", 1)
+    return header, base64.b64decode(payload)
+
+
+def test_thumbnail_hits_and_misses(tmp_path, encoded):
+    path = save_image(tmp_path / "portrait.png", "red")
+    first = assets.thumbnail(path, 60, 40)
+    assert assets.thumbnail(path, 60, 40) == first
+    assert len(encoded) == 1
+    with Image.open(io.BytesIO(first)) as img:
+        assert (img.format, img.size) == ("WEBP", (60 * assets.SCALE, 40 * assets.SCALE))
+
+    # Another display size, or the same content under another name
+    assets.thumbnail(path, 30, 30)
+    assert len(encoded) == 2
+    copy = save_image(tmp_path / "copy.png", "red")
+    assert assets.thumbnail(copy, 60, 40) == first
+    assert len(encoded) == 2
+    assert len(os.listdir(assets.THUMB_DIR)) == 2
+
+
+def test_thumbnail_invalidated_by_new_content(tmp_path, encoded):
+    path = save_image(tmp_path / "portrait.png", "red")
+    before = assets.thumbnail(path, 60, 40)
+    save_image(path, "blue")
+    after = assets.thumbnail(path, 60, 40)
+    assert after != before
+    assert len(encoded) == 2
+    with Image.open(io.BytesIO(after)) as img:
+        assert img.convert("RGB").getpixel((0, 0)) != (255, 0, 0)
+
+
+def test_data_uri_hits_and_invalidation(tmp_path, encoded, monkeypatch):
+    # A cached URI does not even read the thumbnail back from disk
+    reads = []
+    read = assets.thumbnail
+
+    def counting(*args):
+        reads.append(args)
+        return read(*args)
+
+    monkeypatch.setattr(assets, "thumbnail", counting)
+    path = save_image(tmp_path / "portrait.png", "red")
+    first = assets.image_data_uri(path, 60, 40)
+    assert assets.image_data_uri(path, 60, 40) == first
+    assert len(reads) == 1
+    header, payload = decode(first)
+    assert header == "data:image/webp;base64"
+    assert payload == read(path, 60, 40)
+
+    # Another size is another entry; a rewritten file has a new mtime, so
+    # its URI is rebuilt from the new content
+    assets.image_data_uri(path, 30, 30)
+    assert len(reads) == 2
+    save_image(path, "blue")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = assets.image_data_uri(path, 60, 40)
+    assert second != first
+    assert decode(second)[1] == read(path, 60, 40)
+    assert len(reads) == 3
+    assert len(encoded) == 3
+
+
+def test_data_uri_falls_back_to_the_original(tmp_path, encoded, monkeypatch):
+    def unavailable(path, width, height):
+        raise ImportError("PIL")
+
+    monkeypatch.setattr(assets, "_encode_thumbnail", unavailable)
+    path = save_image(tmp_path / "portrait.png", "red")
+    header, payload = decode(assets.image_data_uri(path, 60, 40))
+    assert header == "data:image/png;base64"
+    with open(path, "rb") as f:
+        assert payload == f.read()
+    assert assets.image_data_uri(str(tmp_path / "missing.png"), 60, 40) is None
@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import countries
+import data
+from conftest import CSV
+from countries import INDICATORS
+
+
+def parse_cell(cell):
+    # One value at a time, the way the indicators would be read by hand
+    if cell is None or (isinstance(cell, float) and math.isnan(cell)):
+        return np.nan
+    text = str(cell).strip().replace("$", "").replace(",", "").replace("%", "")
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+@pytest.fixture(scope="module")
+def raw():
+    # Indicator columns as the CSV spells them
+    return pd.read_csv(CSV, encoding="utf-8-sig", dtype=str)
+
+
+@pytest.mark.parametrize("column", list(INDICATORS))
+def test_parse_number_matches_per_cell(raw, column):
+    expected = raw[column].map(parse_cell).astype(float)
+    pd.testing.assert_series_equal(countries.parse_number(raw[column]), expected, check_names=False)
+
+
+def test_parse_number_symbols_and_empty_cells():
+    values = pd.Series(["$2,715,518,274,227 ", "36.6%", " -1.5 ", "", None, "n/a", "1,000"], dtype=object)
+    expected = [2715518274227.0, 36.6, -1.5, np.nan, np.nan, np.nan, 1000.0]
+    np.testing.assert_array_equal(countries.parse_number(values).to_numpy(), expected)
+    np.testing.assert_array_equal(countries.parse_number(pd.Series([1, 2])).to_numpy(), [1.0, 2.0])
+
+
+def test_dimension_takes_first_value_per_country(raw):
+    table = countries.build_country_dimension(data.parse_csv(CSV)).set_index("country")
+    for column, name in INDICATORS.items():
+        known = raw.dropna(subset=["country", column])
+        expected = known.groupby("country")[column].first().map(parse_cell)
+        pd.testing.assert_series_equal(table[name].loc[expected.index], expected, check_names=False)
+
+
+def test_wealth_vs_economy_matches_pandas(dataset, raw):
+    table = countries.wealth_vs_economy().set_index("country")
+    df = data.load_data(["country", "finalWorth"]).dropna(subset=["country"])
+    indicators = raw.iloc[:300].dropna(subset=["country"]).groupby("country")
+    gdp = indicators["gdp_country"].first().map(parse_cell)
+    population = indicators["population_country"].first().map(parse_cell)
+
+    grouped = df.groupby("country", observed=True)["finalWorth"]
+    share = grouped.sum() * 1e6 / gdp.reindex(grouped.sum().index) * 100
+    per_million = grouped.size() / population.reindex(grouped.size().index) * 1e6
+    np.testing.assert_allclose(table["wealth_share_gdp"].loc[share.index], share)
+    np.testing.assert_allclose(table["per_million_people"].loc[per_million.index], per_million)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cube
+import data
+import starts
+
+COLUMNS = cube.DIMENSIONS + [cube.MEASURE]
+
+
+@pytest.mark.parametrize("missing_every", [None, 7])
+def test_slices_match_pandas(frame, missing_every):
+    df = frame[COLUMNS].copy()
+    if missing_every:
+        # Rows without a net worth still count, but not towards the mean
+        df.loc[df.index[::missing_every], cube.MEASURE] = np.nan
+    full = cube.build_cube(df)
+
+    result = cube.slice_cube(["gender"], full, country=["India", "China"])
+    part = df[df["country"].isin(["India", "China"])]
+    expected = part.groupby("gender", observed=True)[cube.MEASURE].agg(["size", "count", "sum", "max", "mean"])
+    np.testing.assert_array_equal(result["count"], expected["size"])
+    np.testing.assert_array_equal(result["valued"], expected["count"])
+    np.testing.assert_allclose(result["sum"], expected["sum"])
+    np.testing.assert_allclose(result["max"], expected["max"])
+    np.testing.assert_allclose(result["mean"], expected["mean"])
+
+    total = cube.slice_cube([], full, industries="Technology")
+    tech = df.loc[df["industries"] == "Technology", cube.MEASURE]
+    assert total["count"].iloc[0] == len(tech)
+    assert total["mean"].iloc[0] == pytest.approx(tech.mean())
+
+
+def test_merged_cube_matches_rebuild(frame):
+    df = frame[COLUMNS]
+    merged = cube.merge_cubes(cube.build_cube(df.iloc[:2000]), df.iloc[2000:])
+    rebuilt = cube.build_cube(df)
+    for by in (["country"], ["industries", "selfMade"], ["ageGroup", "gender"]):
+        pd.testing.assert_frame_equal(cube.slice_cube(by, merged), cube.slice_cube(by, rebuilt), check_dtype=False)
+
+
+def test_starts_counts_complete_rows(frame, monkeypatch):
+    monkeypatch.setattr(starts, "get_cube", lambda: cube.build_cube(frame[COLUMNS]))
+    # The page has always dropped rows missing any of these
+    complete = frame.dropna(subset=["age", "finalWorth", "gender", "country"])
+
+    countries = cube.slice_cube(["country"], starts.complete_cube()).set_index("country")["count"]
+    assert countries.to_dict() == complete["country"].value_counts().to_dict()
+
+    industries = cube.slice_cube(["industries", "selfMade"], starts.complete_cube())
+    expected = complete.groupby(["industries", "selfMade"], observed=True).size()
+    np.testing.assert_array_equal(industries["count"], expected.to_numpy())
+
+
+def test_starts_top_ten_matches_baseline(dataset):
+    complete = data.load_data().dropna(subset=["age", "finalWorth", "gender", "country"])
+    for group in ["All"] + data.AGE_LABELS:
+        part = complete if group == "All" else complete[complete["ageGroup"] == group]
+        expected = part.nlargest(10, "finalWorth", keep="first")
+        assert starts.top_billionaires(group).index.tolist() == expected.index.tolist()
@@ -0,0 +1,41 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import export
+
+
+@pytest.mark.parametrize("fmt", list(export.FORMATS))
+def test_export_matches_pandas(frame, fmt):
+    rows = np.random.default_rng(3).permutation(len(frame))[:777]
+    columns = ["personName", "finalWorth", "country", "age"]
+    names = {"personName": "name", "finalWorth": "net worth"}
+
+    def read(columns, rows):
+        return frame.iloc[rows][columns]
+
+    payload = export.export_file(read, rows, columns, fmt, names, chunk_rows=100)
+
+    assert isinstance(payload, bytes)
+    expected = frame.iloc[rows][columns].rename(columns=names).reset_index(drop=True)
+    if fmt == "CSV":
+        result = pd.read_csv(io.BytesIO(payload))
+        expected = pd.read_csv(io.StringIO(expected.to_csv(index=False)))
+        pd.testing.assert_frame_equal(result, expected)
+    else:
+        result = pd.read_parquet(io.BytesIO(payload))
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+
+
+def test_export_is_capped(frame, monkeypatch):
+    monkeypatch.setattr(export, "MAX_EXPORT_ROWS", 10)
+
+    def read(columns, rows):
+        return frame.iloc[rows][columns]
+
+    with pytest.raises(ValueError):
+        export.export_file(read, np.arange(11), ["rank"], "CSV")
+    # Header plus ten rows
+    assert export.export_file(read, np.arange(10), ["rank"], "CSV").count(b"\n") == 11
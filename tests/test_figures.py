@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+import data
+import figures
+from cache import LRUCache
+from figures import MARKER_GRID, MAX_BARS, MAX_TRACE_POINTS
+
+
+def reference_lttb(x, y, n_out):
+    # Largest-Triangle-Three-Buckets as published, one point at a time
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    keep, a = [0], 0
+    for i in range(n_out - 2):
+        avg_start, avg_end = math.floor((i + 1) * every) + 1, min(math.floor((i + 2) * every) + 1, n)
+        cx, cy = np.mean(x[avg_start:avg_end]), np.mean(y[avg_start:avg_end])
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - cx) * (y[j] - y[a]) - (x[a] - x[j]) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+    return np.array(keep + [n - 1])
+
+
+def test_lttb_matches_reference():
+    rng = np.random.default_rng(5)
+    x = np.sort(rng.uniform(0, 1000, 12_345))
+    y = np.cumsum(rng.normal(size=len(x)))
+    for n_out in (3, 100, 997):
+        np.testing.assert_array_equal(figures.lttb(x, y, n_out), reference_lttb(x, y, n_out))
+    np.testing.assert_array_equal(figures.lttb(x[:50], y[:50], 100), np.arange(50))
+
+
+def test_small_figures_pass_through():
+    fig = go.Figure(go.Bar(x=list("abc"), y=[1, 2, 3]))
+    assert figures.fit_figure(fig) is fig
+
+
+def test_bars_keep_the_largest_and_sum_the_rest():
+    counts = pd.Series(np.random.default_rng(7).integers(1, 1000, 300), index=[f"c{i}" for i in range(300)])
+    fig = figures.fit_figure(go.Figure(go.Bar(x=counts.index, y=counts.to_numpy())))
+    bar = fig.data[0]
+    assert len(bar.x) == MAX_BARS
+
+    top = counts.nlargest(MAX_BARS - 1, keep="first")
+    kept = counts[counts.index.isin(top.index)]
+    assert list(bar.x[:-1]) == list(kept.index)
+    np.testing.assert_array_equal(bar.y[:-1], kept.to_numpy())
+    assert bar.x[-1] == f"Other ({len(counts) - len(kept)})"
+    assert bar.y[-1] == counts.drop(top.index).sum()
+    expected = pd.concat([top, pd.Series({bar.x[-1]: bar.y[-1]})])
+    pd.testing.assert_series_equal(figures.top_categories(counts), expected, check_dtype=False)
+
+
+def test_long_lines_are_downsampled_on_webgl():
+    x = np.arange(50_000, dtype=float)
+    y = np.sin(x / 500)
+    fig = figures.fit_figure(go.Figure(go.Scatter(x=x, y=y, mode="lines")))
+    trace = fig.data[0]
+    assert trace.type == "scattergl"
+    assert len(trace.x) == MAX_TRACE_POINTS
+    assert trace.x[0] == x[0] and trace.x[-1] == x[-1]
+    np.testing.assert_array_equal(trace.y, y[figures.lttb(x, y, MAX_TRACE_POINTS)])
+
+
+def test_markers_keep_one_point_per_cell():
+    rng = np.random.default_rng(11)
+    x, y = rng.normal(size=40_000), rng.exponential(size=40_000)
+    fig = figures.fit_figure(go.Figure(go.Scatter(x=x, y=y, mode="markers", text=[str(i) for i in range(len(x))])))
+    trace = fig.data[0]
+
+    def cell(values):
+        scaled = (values - values.min()) / (values.max() - values.min()) * MARKER_GRID
+        return np.minimum(scaled.astype(np.int64), MARKER_GRID - 1)
+
+    cells = pd.DataFrame({"x": cell(x), "y": cell(y)})
+    expected = np.sort(cells.drop_duplicates().index.to_numpy())
+    np.testing.assert_array_equal(trace.x, x[expected])
+    assert list(trace.text) == [str(i) for i in expected]
+
+
+@pytest.fixture
+def figure_cache(dataset, monkeypatch):
+    # An empty figure cache over the private dataset
+    cache = LRUCache(figures.FIGURE_CACHE.max_bytes)
+    monkeypatch.setattr(figures, "FIGURE_CACHE", cache)
+    return cache
+
+
+def counting_build(builds):
+    def build():
+        builds.append(1)
+        return go.Figure(go.Bar(x=[f"c{i}" for i in range(300)], y=np.arange(300)))
+    return build
+
+
+def test_figure_cache_hits_and_misses(figure_cache):
+    builds = []
+    first = figures.cached_figure("bars", {"country": "China", "top": 10}, counting_build(builds))
+    again = figures.cached_figure("bars", {"top": 10, "country": "China"}, counting_build(builds))
+    assert len(builds) == 1
+    assert (figure_cache.hits, figure_cache.misses) == (1, 1)
+    # The cached spec is the fitted figure, not the one build() returned
+    assert len(again.data[0].x) == MAX_BARS
+    assert again.to_json() == first.to_json()
+
+    figures.cached_figure("bars", {"country": "India", "top": 10}, counting_build(builds))
+    figures.cached_figure("other bars", {"country": "China", "top": 10}, counting_build(builds))
+    assert len(builds) == 3
+    assert figure_cache.stats()["entries"] == 3
+
+
+def test_figure_cache_invalidated_by_new_rows(dataset, figure_cache):
+    builds = []
+    figures.cached_figure("bars", None, counting_build(builds))
+    version = data.data_version()
+    dataset.append(5)
+    assert data.data_version() > version
+
+    figures.cached_figure("bars", None, counting_build(builds))
+    figures.cached_figure("bars", None, counting_build(builds))
+    assert len(builds) == 2
+    assert (figure_cache.hits, figure_cache.misses) == (1, 2)
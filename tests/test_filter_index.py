@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+import filter_index
+from filter_index import FRAME_COLUMNS, SORT_COLUMNS, FilterIndex, SegmentedIndex
+
+PAGE = 50
+
+
+def reference(df, rows, sort_column, descending):
+    # Full sort by key (missing last), then row position
+    part = df.iloc[rows].assign(_row=rows)
+    return part.sort_values([sort_column, "_row"], ascending=[not descending, True], na_position="last")["_row"].to_numpy()
+
+
+@pytest.mark.parametrize("sort_column", SORT_COLUMNS)
+@pytest.mark.parametrize("descending", [True, False])
+def test_pages_match_full_sort(frame, layout, sort_column, descending):
+    df = frame[FRAME_COLUMNS]
+    selection = layout(SegmentedIndex, FilterIndex, df).select()
+    n = selection.count()
+    expected = reference(df, np.arange(len(df)), sort_column, descending)
+
+    pages = [selection.window(start, min(start + PAGE, n), sort_column, descending) for start in range(0, n, PAGE)]
+    np.testing.assert_array_equal(np.concatenate(pages), expected)
+    np.testing.assert_array_equal(selection.window(0, n, sort_column, descending), expected)
+
+
+def test_select_matches_pandas(frame, layout):
+    df = frame[FRAME_COLUMNS]
+    countries = ["United States", "China", "India"]
+    industries = ["Technology", "Finance & Investments"]
+    low, high = 2000, 20000
+    selection = layout(SegmentedIndex, FilterIndex, df).select(
+        {"country": countries, "industries": industries}, value_range=(low, high)
+    )
+
+    mask = df["country"].isin(countries) & df["industries"].isin(industries) & df["finalWorth"].between(low, high)
+    assert selection.count() == int(mask.sum())
+    np.testing.assert_array_equal(selection.rows(), np.flatnonzero(mask))
+    counts = selection.value_counts("industries")
+    expected = df.loc[mask, "industries"].value_counts()
+    assert counts.to_dict() == {k: v for k, v in expected.items() if v}
+
+    expected_rows = reference(df, np.flatnonzero(mask), "age", True)
+    np.testing.assert_array_equal(selection.window(0, len(expected_rows), "age", True), expected_rows)
+
+
+def test_missing_labels_filter_as_unknown(frame):
+    df = frame[FRAME_COLUMNS]
+    selection = SegmentedIndex([FilterIndex(df)]).select({"country": [filter_index.MISSING]})
+    np.testing.assert_array_equal(selection.rows(), np.flatnonzero(df["country"].isna()))
+
+
+def test_search_rows_restrict_selection(frame, layout):
+    df = frame[FRAME_COLUMNS]
+    rows = np.arange(0, len(df), 7)
+    index = layout(SegmentedIndex, FilterIndex, df)
+    np.testing.assert_array_equal(index.select(rows=rows).rows(), rows)
+
+
+def test_value_bounds_skip_missing_worth(frame, layout):
+    df = frame[FRAME_COLUMNS].copy()
+    # One missing net worth in each segment, as canonicalize leaves bad values
+    df.loc[[5, len(df) - 5], "finalWorth"] = np.nan
+    index = layout(SegmentedIndex, FilterIndex, df)
+    assert index.value_bounds() == (df["finalWorth"].min(), df["finalWorth"].max())
+
+    low, high = index.value_bounds()
+    selection = index.select(value_range=(low, high))
+    assert selection.count() == df["finalWorth"].notna().sum()
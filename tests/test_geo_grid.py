@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import geo_grid
+from geo_grid import BASE_CELL, LATITUDE, LONGITUDE, MEASURE, REGIONS, RESOLUTIONS
+
+
+@pytest.fixture(scope="module")
+def points(frame):
+    # The bundled rows (country coordinates, so a few dozen places) plus
+    # scattered synthetic ones, some without a location or a net worth
+    rng = np.random.default_rng(13)
+    n = 20_000
+    scattered = pd.DataFrame({
+        LATITUDE: rng.uniform(-90, 90, n),
+        LONGITUDE: rng.uniform(-180, 180, n),
+        MEASURE: rng.integers(1000, 200_000, n).astype(float),
+    })
+    scattered.loc[::97, LATITUDE] = np.nan
+    scattered.loc[::89, MEASURE] = np.nan
+    return pd.concat([frame[[LATITUDE, LONGITUDE, MEASURE]], scattered], ignore_index=True)
+
+
+def reference(df, region, resolution):
+    # Straight from the rows: base cell of each located row, cells kept by
+    # their centroid, then grouped into the view's bins
+    _, (lat0, lat1), (lon0, lon1) = REGIONS[region]
+    rows = df.dropna(subset=[LATITUDE, LONGITUDE]).copy()
+    rows["row"] = np.floor((rows[LATITUDE] + 90) / BASE_CELL).astype(int)
+    rows["col"] = np.floor((rows[LONGITUDE] + 180) / BASE_CELL).astype(int)
+    centroid = rows.groupby(["row", "col"])[[LATITUDE, LONGITUDE]].transform("mean")
+    rows = rows[centroid[LATITUDE].between(lat0, lat1) & centroid[LONGITUDE].between(lon0, lon1)]
+
+    factor = int(round(geo_grid.bin_size(region, resolution) / BASE_CELL))
+    grouped = rows.groupby([rows["row"] // factor, rows["col"] // factor])
+    result = pd.DataFrame({
+        "lat": grouped[LATITUDE].mean(),
+        "lon": grouped[LONGITUDE].mean(),
+        "count": grouped.size(),
+        "total_worth": grouped[MEASURE].sum() / 1000,
+    })
+    return result.sort_values(["lat", "lon"]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("region", list(REGIONS))
+@pytest.mark.parametrize("resolution", list(RESOLUTIONS))
+def test_bins_match_groupby(points, monkeypatch, region, resolution):
+    monkeypatch.setattr(geo_grid, "get_grid", lambda: geo_grid.build_grid(points))
+    result = geo_grid.bins(region, resolution).sort_values(["lat", "lon"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, reference(points, region, resolution), check_dtype=False)
+
+
+def test_merged_grid_matches_rebuild(points):
+    merged = geo_grid.merge_grids(geo_grid.build_grid(points.iloc[:5000]), points.iloc[5000:])
+    pd.testing.assert_frame_equal(merged, geo_grid.build_grid(points), check_dtype=False)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import inequality
+from inequality import DIMENSIONS, LORENZ_POINTS, OVERALL, PERCENTILES, TOP_SHARE, VALUE_COLUMN
+
+
+def gini(worth):
+    # Mean absolute difference over twice the mean
+    worth = np.asarray(worth, dtype=float)
+    return np.abs(worth[:, None] - worth[None, :]).mean() / (2 * worth.mean())
+
+
+@pytest.fixture(scope="module")
+def stats(frame):
+    return inequality.build_inequality(frame)
+
+
+@pytest.mark.parametrize("dimension", list(DIMENSIONS))
+def test_group_table_matches_pandas(frame, stats, dimension):
+    col = DIMENSIONS[dimension]
+    valued = frame[frame[VALUE_COLUMN].notna()]
+    groups = {OVERALL: valued[VALUE_COLUMN]} if col is None else {
+        label: part[VALUE_COLUMN] for label, part in valued.groupby(col, observed=True)
+    }
+    table = stats[dimension].table
+    assert list(table["group"]) == list(groups)
+
+    for label, worth in groups.items():
+        row = stats[dimension].row(label)
+        assert row["count"] == len(worth)
+        assert row["total_worth"] == pytest.approx(worth.sum())
+        assert row["gini"] == pytest.approx(gini(worth), abs=1e-9)
+        for name, q in PERCENTILES.items():
+            assert row[name] == pytest.approx(worth.quantile(q))
+        top = max(int(np.ceil(TOP_SHARE * len(worth))), 1)
+        assert row["top1_share"] == pytest.approx(worth.nlargest(top).sum() / worth.sum())
+
+
+def test_lorenz_curve_matches_pandas(frame, stats):
+    worth = frame[VALUE_COLUMN].dropna().sort_values().to_numpy(dtype=float)
+    curve = stats["Overall"].curve(OVERALL)
+    assert len(curve) == LORENZ_POINTS
+    taken = np.rint(np.linspace(0, 1, LORENZ_POINTS) * len(worth)).astype(int)
+    expected = np.concatenate(([0.0], np.cumsum(worth)))[taken] / worth.sum()
+    np.testing.assert_allclose(curve, expected)
+    assert curve[0] == 0 and curve[-1] == pytest.approx(1)
@@ -0,0 +1,135 @@
+import csv
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+import cube
+import data
+import filter_index
+import search
+import topk
+
+
+def reference():
+    # The dataset file parsed from scratch, as a fresh process would
+    return data.compact_dtypes(data.parse_csv(data.CSV_PATH))
+
+
+def assert_same_rows(result, expected):
+    pd.testing.assert_frame_equal(
+        result.reset_index(drop=True).astype(object),
+        expected[list(result.columns)].reset_index(drop=True).astype(object),
+    )
+
+
+def test_appended_rows_are_ingested(dataset):
+    assert len(data.load_data()) == 300
+    for n in (40, 1, 25):
+        version = data.refresh().version
+        dataset.append(n)
+        store = data.refresh()
+        assert store.version == version + 1
+        assert store.deltas_since(version) is not None
+    assert_same_rows(data.load_data(), reference())
+
+
+def test_partial_line_waits_until_complete(dataset):
+    data.load_data()
+    line = dataset.lines[dataset.next]
+    with open(dataset.path, "a", encoding="utf-8") as f:
+        f.write(line[:20])
+    assert len(data.refresh().frame) == 300
+
+    with open(dataset.path, "a", encoding="utf-8") as f:
+        f.write(line[20:])
+    dataset.next += 1
+    assert_same_rows(data.load_data(), reference())
+
+
+def test_touch_after_append_does_not_reload(dataset):
+    data.load_data()
+    dataset.append(30)
+    store = data.refresh()
+    assert store.manifest["sha256"] == data._file_hash(dataset.path)
+
+    stat = os.stat(dataset.path)
+    os.utime(dataset.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    touched = data.refresh()
+    assert touched.frame is store.frame
+    assert touched.version == store.version
+
+
+def test_rewrite_reloads(dataset):
+    data.load_data()
+    with open(dataset.path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(dataset.path, "w", encoding="utf-8") as f:
+        f.writelines(lines[:1] + lines[2:])
+    store = data.refresh()
+    assert store.deltas_since(store.version - 1) is None
+    assert_same_rows(data.load_data(), reference())
+
+
+def test_derived_structures_follow_appends(dataset):
+    top, found, index = topk.get_top_k(), search.get_search_index(), filter_index.get_filter_index()
+    for _ in range(3):
+        dataset.append(20)
+        top, found, index = topk.get_top_k(), search.get_search_index(), filter_index.get_filter_index()
+    assert len(top.segments) == len(found.segments) == len(index.segments) == 4
+
+    df = reference()
+    fresh_top = topk.TopK(df)
+    filters = {"country": "United States"}
+    np.testing.assert_array_equal(top.top_k(filters, k=15), fresh_top.top_k(filters, k=15))
+
+    _, rows = found.search("lu")
+    _, fresh_rows = search.SegmentedSearch([search.SearchIndex(df)]).search("lu")
+    np.testing.assert_array_equal(rows, fresh_rows)
+
+    mask = df["country"].eq("United States").to_numpy()
+    np.testing.assert_array_equal(index.select({"country": ["United States"]}).rows(), np.flatnonzero(mask))
+
+
+def test_segment_cap_rebuilds(dataset):
+    topk.get_top_k()
+    for _ in range(data.MAX_SEGMENTS):
+        dataset.append(2)
+        top = topk.get_top_k()
+    assert len(top.segments) == 1
+    np.testing.assert_array_equal(top.top_k(k=20), topk.TopK(reference()).top_k(k=20))
+
+
+def test_empty_self_made_stays_missing(dataset):
+    data.load_data()
+    row = next(csv.reader([dataset.lines[dataset.next]]))
+    header = next(csv.reader([dataset.lines[0].lstrip("\ufeff")]))
+    row[header.index("selfMade")] = ""
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerow(row)
+    with open(dataset.path, "a", encoding="utf-8") as f:
+        f.write(out.getvalue())
+
+    flags = data.load_data(["selfMade"])["selfMade"]
+    assert flags.dtype == "boolean"
+    assert flags.isna().sum() == 1 and flags.iloc[-1] is pd.NA
+    expected = reference()["selfMade"].value_counts()
+    counts = cube.slice_cube(["selfMade"]).set_index("selfMade")["count"]
+    assert counts.to_dict() == expected.to_dict()
+
+
+def test_rows_read_without_loading_columns(dataset):
+    data.load_data(["rank", "personName"])
+    dataset.append(40)
+    rows = np.array([330, 2, 299, 300, 17, 2])
+    columns = ["personName", "city", "selfMade", "rank", "countryOfCitizenship"]
+
+    part = data.read_columns(columns, rows)
+    assert_same_rows(part, reference().iloc[rows])
+    assert list(part.index) == list(rows)
+    report = data.column_report()
+    assert report["columns_loaded"] == 2
+    assert report["projection_saved_bytes"] > report["dtype_saved_bytes"] > 0
+    assert report["saved_bytes"] == report["projection_saved_bytes"] + report["dtype_saved_bytes"]
+    assert len(data.read_columns(columns, [])) == 0
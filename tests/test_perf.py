@@ -0,0 +1,51 @@
+import tracemalloc
+
+import pytest
+from streamlit import runtime
+
+import perf
+import profiler
+
+
+@pytest.fixture(autouse=True)
+def no_owners(monkeypatch):
+    monkeypatch.setattr(perf, "_alloc_owners", set())
+    yield
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def test_tracing_stays_on_while_any_owner_wants_it():
+    perf.set_alloc_tracking(("session", "a"), True)
+    perf.set_alloc_tracking(("session", "b"), True)
+    perf.set_alloc_tracking(("session", "a"), False)
+    assert tracemalloc.is_tracing()
+    perf.set_alloc_tracking(("session", "b"), False)
+    assert not tracemalloc.is_tracing()
+
+
+def test_closed_sessions_release_tracing(monkeypatch):
+    class Runtime:
+        def is_active_session(self, session_id):
+            return session_id == "open"
+
+    monkeypatch.setattr(runtime, "exists", lambda: True)
+    monkeypatch.setattr(runtime, "get_instance", lambda: Runtime())
+    perf.set_alloc_tracking(("session", "open"), True)
+    perf.set_alloc_tracking(("session", "closed"), True)
+
+    perf._release_closed_sessions()
+    assert perf._alloc_owners == {("session", "open")}
+    assert tracemalloc.is_tracing()
+
+
+def test_profiler_leaves_session_tracing_on():
+    perf.set_alloc_tracking(("session", "a"), True)
+    result = profiler.profile_page("homepage")
+    assert result["error"] is None
+    assert tracemalloc.is_tracing()
+    assert perf._alloc_owners == {("session", "a")}
+
+    perf.set_alloc_tracking(("session", "a"), False)
+    profiler.profile_page("homepage")
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from results import quantize_range
+
+
+@pytest.mark.parametrize("bounds", [(1000.0, 211000.0), (1000.3, 211000.7), (0.25, 10.1)])
+def test_range_stays_on_the_slider_grid(bounds):
+    step = 0.5
+    lowest, highest = bounds
+    grid = lowest + np.arange(int((highest - lowest) / step) + 1) * step
+    for low, high in [(grid[3], grid[-4]), (grid[1], highest), (lowest, highest)]:
+        noisy = (low + 1e-11, high - 1e-11)
+        quantized = quantize_range(noisy, step, bounds)
+        assert quantized == quantize_range((low, high), step, bounds)
+        # Never below the chosen lower bound or above the chosen upper one
+        assert low - 1e-9 <= quantized[0] <= low + 1e-9
+        assert high - 1e-9 <= quantized[1] <= high + 1e-9
+        assert lowest <= quantized[0] <= quantized[1] <= highest
+
+
+def test_range_keeps_rows_on_the_grid():
+    bounds = (1000.3, 5000.0)
+    values = np.array([1000.3, 1000.8, 1001.3, 4999.8, 5000.0])
+    low, high = quantize_range((1000.3 + 2 * 0.5, 5000.0), 0.5, bounds)
+    np.testing.assert_array_equal((values >= low) & (values <= high), [False, False, True, True, True])
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from search import SEARCH_FIELDS, SearchIndex, SegmentedSearch, normalize
+
+
+def reference_rows(df, query):
+    # Rows where any searched field contains the query; a single character
+    # has to start a word
+    query = normalize(pd.Series([query])).iloc[0]
+    mask = np.zeros(len(df), dtype=bool)
+    for field in SEARCH_FIELDS:
+        text = normalize(df[field])
+        if len(query) == 1:
+            mask |= (" " + text).str.contains(" " + query, regex=False).to_numpy(dtype=bool)
+        else:
+            mask |= text.str.contains(query, regex=False).to_numpy(dtype=bool)
+    return np.flatnonzero(mask)
+
+
+@pytest.mark.parametrize("query", ["m", "lu", "Musk", "ÉLON", "walton", "software", "& family", "zzzq"])
+def test_rows_match_pandas(frame, layout, query):
+    df = frame[list(SEARCH_FIELDS)]
+    _, rows = layout(SegmentedSearch, SearchIndex, df).search(query)
+    np.testing.assert_array_equal(rows, reference_rows(df, query))
+
+
+def test_match_counts_and_ranking(frame, layout):
+    df = frame[list(SEARCH_FIELDS)]
+    matches, _ = layout(SegmentedSearch, SearchIndex, df).search("walton")
+    assert len(matches)
+    for match in matches.itertuples():
+        assert match.count == (df[match.field] == match.value).sum()
+        assert "walton" in normalize(pd.Series([match.value])).iloc[0]
+    assert matches["score"].is_monotonic_decreasing
+
+
+def test_typo_falls_back_to_fuzzy(frame, layout):
+    df = frame[list(SEARCH_FIELDS)]
+    matches, rows = layout(SegmentedSearch, SearchIndex, df).search("arnalt")
+    assert "Bernard Arnault & family" in set(matches["value"])
+    assert len(rows) and not len(reference_rows(df, "arnalt"))
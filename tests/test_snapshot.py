@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+import cube
+import data
+import snapshot
+
+
+def test_round_trip_maps_arrays_read_only(tmp_path, frame):
+    values = {"frame": frame, "array": np.arange(1000, dtype=np.int64), "nested": {"a": [np.ones(3), "label"]}}
+    snapshot.write(str(tmp_path), "test", values, {"note": 1})
+    snap = snapshot.open_snapshot(str(tmp_path), "test")
+
+    assert snap.meta == {"note": 1}
+    pd.testing.assert_frame_equal(snap.load("frame"), frame)
+    array = snap.load("array")
+    np.testing.assert_array_equal(array, values["array"])
+    assert not array.flags.writeable
+    assert snap.load("nested")["a"][1] == "label"
+
+
+def test_rewrite_publishes_new_file(tmp_path):
+    first = snapshot.write(str(tmp_path), "test", {"v": np.zeros(3)}, {})
+    second = snapshot.write(str(tmp_path), "test", {"v": np.ones(3)}, {})
+    assert first != second
+    np.testing.assert_array_equal(snapshot.open_snapshot(str(tmp_path), "test").load("v"), np.ones(3))
+    assert snapshot.open_snapshot(str(tmp_path), "missing") is None
+
+
+def _restart(monkeypatch):
+    # A new server process: no store and no derived structures yet
+    monkeypatch.setattr(data, "_store", None)
+    monkeypatch.setattr(data, "_derived", {})
+
+
+def test_process_starts_from_snapshot(dataset, monkeypatch):
+    expected = cube.get_cube()
+    data.write_snapshot()
+    _restart(monkeypatch)
+
+    store = data.refresh()
+    assert store.snapshot is not None and store.version == 1
+    pd.testing.assert_frame_equal(cube.get_cube(), expected)
+
+
+def test_rows_appended_after_build_are_ingested(dataset, monkeypatch):
+    cube.get_cube()
+    data.write_snapshot()
+    dataset.append(40)
+    _restart(monkeypatch)
+
+    store = data.refresh()
+    assert store.snapshot is not None and len(store.frame) == 340 and store.version == 2
+    rebuilt = cube.build_cube(data.load_data())
+    merged = cube.get_cube()
+    assert merged["count"].sum() == rebuilt["count"].sum() == 340
+
+
+def test_snapshot_from_other_code_is_ignored(dataset, monkeypatch):
+    cube.get_cube()
+    data.write_snapshot()
+    _restart(monkeypatch)
+    real = data._source_hash
+    monkeypatch.setattr(data, "_source_hash", lambda module: "changed" if module == "cube" else real(module))
+
+    assert data.refresh().snapshot is None
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from topk import GROUP_DIMENSIONS, VALUE_COLUMN, SegmentedTopK, TopK
+
+FILTERS = [
+    {},
+    {"country": "United States"},
+    {"gender": "Female", "industries": ["Technology", "Finance & Investments"]},
+    {"ageGroup": ["41–50", "51–60"], "country": ["China", "India"], "gender": "Male"},
+    {"country": "Nowhere"},
+]
+
+
+def reference(df, filters, k):
+    # Richest first, ties in row order
+    mask = np.ones(len(df), dtype=bool)
+    for dim, value in filters.items():
+        mask &= df[dim].isin(value if isinstance(value, list) else [value]).to_numpy()
+    part = df[mask].reset_index(drop=True).assign(_row=np.flatnonzero(mask))
+    return part.sort_values([VALUE_COLUMN, "_row"], ascending=[False, True])["_row"].to_numpy()[:k]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("k", [1, 10, 500])
+def test_top_k_matches_pandas(frame, layout, filters, k):
+    df = frame[GROUP_DIMENSIONS + [VALUE_COLUMN]]
+    top = layout(SegmentedTopK, TopK, df)
+    np.testing.assert_array_equal(top.top_k(filters, k), reference(df, filters, k))
+
+
+def test_unknown_dimension_is_rejected(frame):
+    with pytest.raises(ValueError):
+        TopK(frame[GROUP_DIMENSIONS + [VALUE_COLUMN]]).top_k({"city": "Paris"})
@@ -0,0 +1,141 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from data import append_segment, derived
+
+# ---------------------- TOP-K RANKINGS ----------------------
+# Rows are ranked once by net worth (rank 0 = richest). For every single
+# group dimension and every pair of them, the ranks of each group are stored
+# contiguously and in order, so the top k of a precomputed group is a slice.
+# Other filter combinations start from the best precomputed group and use a
+# partial selection over its members instead of sorting the frame. Ingested
+# rows are ranked in a segment of their own and merged at query time.
+
+GROUP_DIMENSIONS = ["ageGroup", "country", "industries", "gender"]
+VALUE_COLUMN = "finalWorth"
+MAX_COMBINATION = 2
+
+
+class TopK:
+
+    def __init__(self, df, dimensions=GROUP_DIMENSIONS, value_column=VALUE_COLUMN, offset=0):
+        # `offset` is the row position of df's first row in the full frame
+        values = df[value_column].to_numpy(dtype=float, na_value=np.nan)
+        # Descending by value with NaN last; stable so ties keep row order
+        self.order = np.argsort(-values, kind="stable")
+        self.ranked_values = values[self.order]
+        rank_dtype = np.int32 if len(df) < 2**31 else np.int64
+
+        self.codes = {}
+        self.lookup = {}
+        for dim in dimensions:
+            codes, uniques = pd.factorize(df[dim], sort=True)
+            # Codes in rank order, so codes[rank] is the label of the rank-th richest
+            self.codes[dim] = codes[self.order]
+            self.lookup[dim] = {value: code for code, value in enumerate(uniques)}
+
+        self.groups = {}
+        for size in range(1, MAX_COMBINATION + 1):
+            for combo in itertools.combinations(dimensions, size):
+                self.groups[combo] = self._build_groups(combo, rank_dtype)
+        self.order += offset
+
+    def _group_keys(self, combo, codes_per_dim):
+        # Mixed-radix key over the dimension codes of `combo`
+        key = np.zeros(len(codes_per_dim[0]), dtype=np.int64)
+        for dim, codes in zip(combo, codes_per_dim):
+            key = key * len(self.lookup[dim]) + codes
+        return key
+
+    def _build_groups(self, combo, rank_dtype):
+        codes = [self.codes[dim] for dim in combo]
+        valid = np.logical_and.reduce([c >= 0 for c in codes])
+        ranks = np.flatnonzero(valid)
+        keys = self._group_keys(combo, [c[ranks] for c in codes])
+        # Stable sort by group keeps ranks ascending inside each group
+        by_group = np.argsort(keys, kind="stable")
+        keys = keys[by_group]
+        unique_keys, starts = np.unique(keys, return_index=True)
+        ends = np.append(starts[1:], len(keys))
+        return unique_keys, starts, ends, ranks[by_group].astype(rank_dtype)
+
+    def _codes_for(self, dim, value):
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        lookup = self.lookup[dim]
+        return [lookup[v] for v in values if v in lookup]
+
+    def _candidates(self, combo, filters, limit=None):
+        # Ranks of every group matching `filters` on `combo`, each group in order
+        unique_keys, starts, ends, ranks = self.groups[combo]
+        code_lists = [self._codes_for(dim, filters[dim]) for dim in combo]
+        if not all(code_lists):
+            return np.zeros(0, dtype=ranks.dtype)
+        wanted = np.array(list(itertools.product(*code_lists)), dtype=np.int64)
+        keys = self._group_keys(combo, wanted.T)
+        at = np.searchsorted(unique_keys, keys)
+        at = at[(at < len(unique_keys)) & (unique_keys[np.minimum(at, len(unique_keys) - 1)] == keys)]
+        parts = [
+            ranks[starts[i]:ends[i] if limit is None else min(ends[i], starts[i] + limit)]
+            for i in at
+        ]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=ranks.dtype)
+
+    def top_ranks(self, filters=None, k=10):
+        # Ranks of the k richest rows matching `filters`, richest first
+        filters = {dim: value for dim, value in (filters or {}).items() if value is not None}
+        unknown = set(filters) - set(self.codes)
+        if unknown:
+            raise ValueError(f"Not a top-k group dimension: {sorted(unknown)}")
+        if k <= 0:
+            return np.arange(0)
+        if not filters:
+            return np.arange(min(k, len(self.order)))
+
+        combo = tuple(dim for dim in self.codes if dim in filters)
+        if combo in self.groups:
+            # Precomputed: the first k ranks of each matching group are enough
+            candidates = self._candidates(combo, filters, limit=k)
+        else:
+            # Start from the precomputed pair that covers the most filters and
+            # check the remaining dimensions on its members only
+            base = max((c for c in self.groups if set(c) <= set(filters)), key=len)
+            candidates = self._candidates(base, filters)
+            for dim in combo:
+                if dim not in base:
+                    codes = self._codes_for(dim, filters[dim])
+                    candidates = candidates[np.isin(self.codes[dim][candidates], codes)]
+
+        if len(candidates) > k:
+            candidates = np.partition(candidates, k - 1)[:k]
+        return np.sort(candidates)
+
+    def top_k(self, filters=None, k=10):
+        # filters: {dimension: value or list of values}; returns row positions,
+        # richest first
+        return self.order[self.top_ranks(filters, k)]
+
+
+class SegmentedTopK:
+    # One TopK per ingested batch of rows; each segment's top k are merged
+
+    def __init__(self, segments):
+        self.segments = segments
+
+    def top_k(self, filters=None, k=10):
+        if len(self.segments) == 1:
+            return self.segments[0].top_k(filters, k)
+        rows, values = [], []
+        for seg in self.segments:
+            ranks = seg.top_ranks(filters, k)
+            rows.append(seg.order[ranks])
+            values.append(seg.ranked_values[ranks])
+        rows, values = np.concatenate(rows), np.concatenate(values)
+        # Richest first, NaN last, ties in row order
+        return rows[np.lexsort((rows, -values))[:k]]
+
+
+@derived(columns=GROUP_DIMENSIONS + [VALUE_COLUMN], update=append_segment(TopK, SegmentedTopK))
+def get_top_k(df):
+    return SegmentedTopK([TopK(df)])
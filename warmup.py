@@ -0,0 +1,114 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+import data
+import registry
+
+# ---------------------- CACHE WARM-UP ----------------------
+# A background thread renders every page's default view once, outside any
+# browser session (Streamlit's "bare mode": widgets return their defaults
+# and elements are dropped). That loads the shared frame and fills the
+# figure cache and the thumbnails with exactly what a first visitor's view
+# asks for; then every derived structure the pages registered is built,
+# including those only an interaction needs. Requests are served meanwhile;
+# one that needs a structure still being built waits for that build
+# instead of starting its own.
+#
+# `streamlit run web.py` starts the warm-up with the first session;
+# `python warmup.py [streamlit options]` starts it with the server process.
+
+THREAD_NAME = "cache-warmup"
+ENABLED = os.environ.get("BILLIONAIRES_WARMUP", "1") != "0"
+
+_lock = threading.Lock()
+_thread = None
+# state: "idle", "running", "done" or "failed"; steps: one per warmed page
+_status = {"state": "idle", "started": None, "seconds": None, "steps": []}
+
+
+# Threads that render pages outside any session, where Streamlit's warning
+# about the missing script context on every call is expected
+_bare_threads = {THREAD_NAME}
+
+
+def _quiet_bare_mode(record):
+    return record.threadName not in _bare_threads
+
+
+def silence_bare_mode(thread_name=THREAD_NAME):
+    _bare_threads.add(thread_name)
+    for name, logger in list(logging.root.manager.loggerDict.items()):
+        if name.startswith("streamlit") and isinstance(logger, logging.Logger):
+            if _quiet_bare_mode not in logger.filters:
+                logger.addFilter(_quiet_bare_mode)
+
+
+def _step(name, func):
+    entry = {"step": name, "seconds": None, "error": None}
+    start = time.perf_counter()
+    try:
+        func()
+    except Exception as exc:
+        entry["error"] = f"{type(exc).__name__}: {exc}"
+    entry["seconds"] = time.perf_counter() - start
+    with _lock:
+        _status["steps"].append(entry)
+    return entry["error"] is None
+
+
+def _warm():
+    start = time.perf_counter()
+    ok = True
+    for key in registry.PAGES:
+        # Imported first so every streamlit logger exists before filtering
+        ok &= _step(f"import {key}", lambda key=key: registry.load_page(key))
+        silence_bare_mode()
+        ok &= _step(key, lambda key=key: registry.load_page(key).show())
+    # Structures no default view needs (e.g. the search index, built on the
+    # first query), registered by the page imports above
+    for key, get in data.registered().items():
+        ok &= _step(f"build {key}", get)
+    with _lock:
+        _status["seconds"] = time.perf_counter() - start
+        _status["state"] = "done" if ok else "failed"
+
+
+def start():
+    # Idempotent: the first call of the process starts the thread
+    global _thread
+    if not ENABLED:
+        return
+    with _lock:
+        if _thread is not None:
+            return
+        _status.update(state="running", started=time.time())
+        _thread = threading.Thread(target=_warm, name=THREAD_NAME, daemon=True)
+    _thread.start()
+
+
+def status():
+    # Copy of the warm-up state with per-step durations
+    with _lock:
+        return dict(_status, steps=[dict(step) for step in _status["steps"]])
+
+
+def wait(timeout=None):
+    thread = _thread
+    if thread is not None:
+        thread.join(timeout)
+    return status()
+
+
+if __name__ == "__main__":
+    # Warm up while the server starts: python warmup.py --server.port 8501
+    from streamlit.web import cli
+
+    # Through the module, so web.py's own start() finds the running thread
+    import warmup
+    warmup.start()
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web.py")
+    sys.argv = ["streamlit", "run", script] + sys.argv[1:]
+    sys.exit(cli.main())